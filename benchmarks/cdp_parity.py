@@ -0,0 +1,131 @@
+"""
+CDP / WebDriver parity check : extracts the same mock-site details pages
+(benchmarks/mock_site.py) through the WebDriver path (open_hospital_page ->
+process_hospital_page) and the CDP path (extract_with_cdp) of one browser.
+
+Fails if the two paths extract different records, or if a details page that
+answers with the verification page is not reported to the pacer as a block on
+either path.
+
+Usage : python benchmarks/cdp_parity.py [--hospitals 5] [--headless] [--extract-mode soup|js]
+"""
+import os
+import sys
+import copy
+import argparse
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import scraper
+from mock_site import MockSite, start_server
+from e2e_benchmark import configure_scraper
+
+
+BLOCKED_RECNO = "blocked"
+BLOCKED_NAME = "Blocked Animal Hospital"
+
+
+def load_city(aaha_scraper, site, base_url, count):
+    """Fills the per-city state the way process_search_results would, for `count` hospitals plus a blocked one."""
+    aaha_scraper.reset_city()
+    aaha_scraper.country, aaha_scraper.city, aaha_scraper.state = "United States", "Paritytown", "TX"
+    hospitals = {}
+    for recno in sorted(site.pool):
+        hospitals.setdefault(site.pool[recno]["name"], recno)
+        if len(hospitals) == count:
+            break
+    hospitals[BLOCKED_NAME] = BLOCKED_RECNO
+    for name, recno in hospitals.items():
+        aaha_scraper.extracted_data.append({"Name": name})
+        aaha_scraper.hospital_names.append(name)
+        aaha_scraper.hospital_links[name] = f"{base_url}/search/?recno={recno}"
+    return list(hospitals)
+
+
+def count_blocks(aaha_scraper):
+    """Wraps the pacer's on_block, returns the list the reasons are collected in."""
+    blocks = []
+    on_block = aaha_scraper.pacer.on_block
+
+    def recorded(reason="verification page"):
+        blocks.append(reason)
+        on_block(reason)
+
+    aaha_scraper.pacer.on_block = recorded
+    return blocks
+
+
+def run_parity(args):
+    site = MockSite(blocked_recnos={BLOCKED_RECNO})
+    server, base_url = start_server(site)
+    work_folder = tempfile.mkdtemp(prefix="aaha_parity_")
+
+    aaha_scraper = scraper.AahaScraper()
+    configure_scraper(aaha_scraper, base_url, work_folder)
+    aaha_scraper.headless = args.headless
+    aaha_scraper.sleep_scale = 0.01
+    aaha_scraper.extract_mode = args.extract_mode
+    aaha_scraper.detail_tabs = args.tabs
+    aaha_scraper.use_hospital_index = False
+    blocks = count_blocks(aaha_scraper)
+    try:
+        aaha_scraper.driver = aaha_scraper.sessions.acquire()
+
+        names = load_city(aaha_scraper, site, base_url, args.hospitals)
+        webdriver_ok = [
+            name for name in names
+            if aaha_scraper.open_hospital_page(name, aaha_scraper.hospital_links[name])
+        ]
+        webdriver_records = copy.deepcopy(aaha_scraper.extracted_data)
+        webdriver_blocks = len(blocks)
+
+        load_city(aaha_scraper, site, base_url, args.hospitals)
+        cdp_ok = aaha_scraper.extract_with_cdp(names)
+        cdp_records = copy.deepcopy(aaha_scraper.extracted_data)
+        cdp_blocks = len(blocks) - webdriver_blocks
+    finally:
+        aaha_scraper.sessions.close()
+        aaha_scraper.search_cache.close()
+        aaha_scraper.hospital_index.close()
+        server.shutdown()
+
+    failures = []
+    if sorted(webdriver_ok) != sorted(cdp_ok):
+        failures.append(f"extracted hospitals differ : webdriver {sorted(webdriver_ok)} / cdp {sorted(cdp_ok)}")
+    for webdriver_record, cdp_record in zip(webdriver_records, cdp_records):
+        if webdriver_record != cdp_record:
+            failures.append(f"records differ for {webdriver_record['Name']} :\n  webdriver {webdriver_record}\n  cdp       {cdp_record}")
+    if BLOCKED_NAME in webdriver_ok or BLOCKED_NAME in cdp_ok:
+        failures.append("the verification page was extracted as a hospital")
+    if not webdriver_blocks:
+        failures.append("WebDriver path did not report the verification page as a block")
+    if not cdp_blocks:
+        failures.append("CDP path did not report the verification page as a block")
+
+    print(f"\nExtract mode : {args.extract_mode}, {len(names) - 1} hospitals + 1 verification page")
+    print(f"WebDriver : {len(webdriver_ok)} extracted, {webdriver_blocks} blocks reported")
+    print(f"CDP       : {len(cdp_ok)} extracted, {cdp_blocks} blocks reported")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    print("Parity OK" if not failures else f"{len(failures)} parity failures")
+    return not failures
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare CDP and WebDriver details extraction on the mock site.")
+    parser.add_argument("--hospitals", type=int, default=5)
+    parser.add_argument("--tabs", type=int, default=2, help="CDP tabs in flight")
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--extract-mode", choices=("soup", "js"), default=scraper.EXTRACT_MODE)
+    return parser.parse_args(argv)
+
+
+def main():
+    if not run_parity(parse_args()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
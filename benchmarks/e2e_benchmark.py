@@ -0,0 +1,218 @@
+"""
+End-to-end throughput benchmark : drives AahaScraper against the local mock site
+(benchmarks/mock_site.py), so no request ever reaches aaha.org.
+
+Reports cities/hour, hospitals/minute, per-phase latency percentiles and the
+peak RSS of Python plus the chromedriver/Chrome process tree.
+
+Usage : python benchmarks/e2e_benchmark.py --cities 5 --latency 0.2 --sleep-scale 0.02 \
+            [--verify-failure-rate 0.1] [--headless] [--detail-mode direct] [--detail-tabs 3]
+            [--extract-mode js] [--json results.json]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+import statistics
+from collections import defaultdict
+
+import psutil
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import scraper
+from hospital_index import HospitalIndex
+from page_archive import PageArchive
+from locations_store import LocationsStore
+from output_sink import OutputSink
+from metrics import Metrics
+from search_cache import SearchCache
+from mock_site import MockSite, start_server
+
+
+PHASES = (
+    "get_driver", "visit_random_sites", "open_search_page", "process_search_results",
+    "extract_from_pages", "process_hospital_page", "save_output",
+)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def instrument(aaha_scraper, timings, counters):
+    """Wraps the scraper's phase methods on the instance to time every call."""
+    for name in PHASES:
+        original = getattr(aaha_scraper, name)
+
+        def timed(*args, _original=original, _name=name, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = _original(*args, **kwargs)
+            finally:
+                timings[_name].append(time.perf_counter() - start)
+            if _name == "save_output":
+                counters["hospitals"] += len(kwargs.get("extracted_data", args[0] if args else []))
+            return result
+
+        setattr(aaha_scraper, name, timed)
+
+
+class MemorySampler(threading.Thread):
+    """Samples RSS of this process and of its child tree (chromedriver + Chrome)."""
+    def __init__(self, interval=0.5):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples = []
+        self.stopped = threading.Event()
+
+    def run(self):
+        process = psutil.Process()
+        while not self.stopped.is_set():
+            python_rss = process.memory_info().rss
+            browser_rss = 0
+            for child in process.children(recursive=True):
+                try:
+                    browser_rss += child.memory_info().rss
+                except psutil.Error:
+                    continue
+            self.samples.append((python_rss, browser_rss))
+            self.stopped.wait(self.interval)
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def configure_scraper(aaha_scraper, base_url, work_folder):
+    """Points a scraper at the mock site and keeps every file it writes inside `work_folder`."""
+    aaha_scraper.search_url = f"{base_url}/search/"
+    aaha_scraper.random_sites = [f"{base_url}/random/{i}" for i in range(4)]
+    # The stores opened on the real output folder are swapped for temporary ones
+    aaha_scraper.hospital_index.close()
+    aaha_scraper.search_cache.close()
+    aaha_scraper.hospital_index = HospitalIndex(os.path.join(work_folder, 'hospital_index.sqlite3'))
+    aaha_scraper.page_archive = PageArchive(os.path.join(work_folder, 'archive'))
+    aaha_scraper.locations_store = LocationsStore(os.path.join(work_folder, 'locations'))
+    aaha_scraper.output_sink = OutputSink(os.path.join(work_folder, 'dataset'))
+    aaha_scraper.metrics = Metrics(os.path.join(work_folder, 'metrics.jsonl'))
+    aaha_scraper.memory_watchdog.log_path = os.path.join(work_folder, 'memory.jsonl')
+    aaha_scraper.search_cache = SearchCache(os.path.join(work_folder, 'search_cache.sqlite3'))
+    aaha_scraper.change_log.file_path = os.path.join(work_folder, 'changes.jsonl')
+
+
+def run_benchmark(args):
+    site = MockSite(latency=args.latency, jitter=args.jitter, verify_failure_rate=args.verify_failure_rate)
+    server, base_url = start_server(site)
+    work_folder = tempfile.mkdtemp(prefix="aaha_bench_")
+
+    aaha_scraper = scraper.AahaScraper()
+    configure_scraper(aaha_scraper, base_url, work_folder)
+    aaha_scraper.headless = args.headless
+    aaha_scraper.sleep_scale = args.sleep_scale
+    aaha_scraper.detail_mode = args.detail_mode
+    aaha_scraper.detail_tabs = args.detail_tabs
+    aaha_scraper.engine = args.engine
+    aaha_scraper.extract_mode = args.extract_mode
+
+    timings = defaultdict(list)
+    counters = defaultdict(int)
+    instrument(aaha_scraper, timings, counters)
+    cities = [(f"Benchtown {i}", args.state) for i in range(1, args.cities + 1)]
+    statuses = defaultdict(int)
+
+    sampler = MemorySampler()
+    sampler.start()
+    started = time.perf_counter()
+    try:
+        for city, state in cities:
+            statuses[aaha_scraper.scrape_city(country="United States", city=city, state=state) or "undecided"] += 1
+            aaha_scraper.sessions.release()
+    finally:
+        aaha_scraper.sessions.close()
+        aaha_scraper.search_cache.close()
+        aaha_scraper.hospital_index.close()
+        elapsed = time.perf_counter() - started
+        sampler.stop()
+        server.shutdown()
+
+    return {
+        "config": vars(args),
+        "elapsed_s": elapsed,
+        "cities": len(cities),
+        "statuses": dict(statuses),
+        "hospitals": counters["hospitals"],
+        "cities_per_hour": len(cities) / elapsed * 3600,
+        "hospitals_per_minute": counters["hospitals"] / elapsed * 60,
+        "site_requests": dict(site.stats),
+        "phases": {
+            name: {
+                "calls": len(values),
+                "total_s": sum(values),
+                "p50_s": percentile(values, 50),
+                "p90_s": percentile(values, 90),
+                "p99_s": percentile(values, 99),
+                "max_s": max(values),
+            }
+            for name, values in timings.items() if values
+        },
+        "memory": {
+            "python_peak_mb": max((s[0] for s in sampler.samples), default=0) / 2**20,
+            "browser_peak_mb": max((s[1] for s in sampler.samples), default=0) / 2**20,
+            "browser_mean_mb": statistics.mean(s[1] for s in sampler.samples) / 2**20 if sampler.samples else 0,
+        },
+        "output_folder": work_folder,
+    }
+
+
+def print_report(result):
+    print(f"\nCities: {result['cities']} {result['statuses']}  Hospitals: {result['hospitals']}  "
+          f"Elapsed: {result['elapsed_s']:.1f}s")
+    print(f"Throughput: {result['cities_per_hour']:.1f} cities/hour, {result['hospitals_per_minute']:.1f} hospitals/minute")
+    print(f"Mock site requests: {result['site_requests']}\n")
+    print(f"{'phase':<24}{'calls':>7}{'total s':>10}{'p50 s':>9}{'p90 s':>9}{'p99 s':>9}{'max s':>9}")
+    for name, phase in result["phases"].items():
+        print(f"{name:<24}{phase['calls']:>7}{phase['total_s']:>10.2f}{phase['p50_s']:>9.2f}"
+              f"{phase['p90_s']:>9.2f}{phase['p99_s']:>9.2f}{phase['max_s']:>9.2f}")
+    memory = result["memory"]
+    print(f"\nMemory: python peak {memory['python_peak_mb']:.0f} MB, browser peak {memory['browser_peak_mb']:.0f} MB "
+          f"(mean {memory['browser_mean_mb']:.0f} MB)")
+    print(f"Scraper output in {result['output_folder']}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark AahaScraper against the local mock AAHA site.")
+    parser.add_argument("--cities", type=int, default=5)
+    parser.add_argument("--state", default="TX")
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--verify-failure-rate", type=float, default=0.0)
+    parser.add_argument("--sleep-scale", type=float, default=0.02, help="multiplier on the scraper's random sleeps")
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--detail-mode", choices=("click", "direct"), default=scraper.DETAIL_MODE)
+    parser.add_argument("--detail-tabs", type=int, default=scraper.DETAIL_TABS)
+    parser.add_argument("--extract-mode", choices=("soup", "js"), default=scraper.EXTRACT_MODE)
+    parser.add_argument("--engine", choices=("selenium", "cdp"), default=scraper.ENGINE, help="details page backend (direct mode)")
+    parser.add_argument("--json", help="also write the results to this file")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    result = run_benchmark(args)
+    print_report(result)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(result, file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Per-worker footprint benchmark : runs the same search flow against the local mock
+site (benchmarks/mock_site.py) with headed and with headless Chrome, and reports
+each worker's browser memory (RSS of chromedriver + Chrome's process tree) and
+CPU time, plus the fingerprint the pages saw in each mode.
+
+Headed runs need a display (on Linux run under `xvfb-run` or set DISPLAY);
+without one only the headless mode is measured.
+
+Usage : python benchmarks/footprint_benchmark.py --workers 2 --cities 3 --latency 0.2 \
+            [--modes headless headed] [--no-profile] [--json results.json]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import threading
+import statistics
+from collections import defaultdict
+
+import psutil
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import scraper
+from browser_profile import FINGERPRINT_JS
+from mock_site import MockSite, start_server
+from e2e_benchmark import configure_scraper
+
+
+class TreeSampler(threading.Thread):
+    """Samples RSS and CPU time of every registered worker's browser process tree."""
+    def __init__(self, interval=0.5):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.roots = {}
+        self.rss = defaultdict(list)
+        self.cpu = {}
+        self.python_rss = []
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+
+    def register(self, worker_id, pid):
+        with self.lock:
+            self.roots[worker_id] = pid
+
+    def sample(self):
+        with self.lock:
+            roots = dict(self.roots)
+        for worker_id, pid in roots.items():
+            try:
+                root = psutil.Process(pid)
+                tree = [root] + root.children(recursive=True)
+            except psutil.Error:
+                continue
+            rss, cpu = 0, 0.0
+            for process in tree:
+                try:
+                    rss += process.memory_info().rss
+                    times = process.cpu_times()
+                    cpu += times.user + times.system
+                except psutil.Error:
+                    continue
+            self.rss[worker_id].append(rss)
+            # CPU times only grow; keep the last reading taken while the tree was alive
+            self.cpu[worker_id] = max(cpu, self.cpu.get(worker_id, 0.0))
+        self.python_rss.append(psutil.Process().memory_info().rss)
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.sample()
+            self.stopped.wait(self.interval)
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def run_worker(worker_id, cities, base_url, work_folder, headless, args, sampler, results):
+    aaha_scraper = scraper.AahaScraper()
+    configure_scraper(aaha_scraper, base_url, os.path.join(work_folder, f"worker_{worker_id}"))
+    aaha_scraper.headless = headless
+    aaha_scraper.headless_profile = not args.no_profile
+    aaha_scraper.sleep_scale = args.sleep_scale
+    statuses = defaultdict(int)
+    fingerprint = None
+    try:
+        aaha_scraper.sessions.acquire()
+        sampler.register(worker_id, aaha_scraper.driver.service.process.pid)
+        for city, state in cities:
+            statuses[aaha_scraper.scrape_city(country="United States", city=city, state=state) or "undecided"] += 1
+            aaha_scraper.sessions.release()
+            if aaha_scraper.driver is not None:
+                sampler.register(worker_id, aaha_scraper.driver.service.process.pid)
+        driver = aaha_scraper.sessions.acquire()
+        fingerprint = driver.execute_script(FINGERPRINT_JS)
+        # Last reading before the tree goes away
+        sampler.sample()
+    finally:
+        aaha_scraper.sessions.close()
+        aaha_scraper.search_cache.close()
+        aaha_scraper.hospital_index.close()
+    results[worker_id] = {"statuses": dict(statuses), "fingerprint": fingerprint}
+
+
+def run_mode(headless, args):
+    site = MockSite(latency=args.latency, jitter=args.jitter)
+    server, base_url = start_server(site)
+    work_folder = tempfile.mkdtemp(prefix="aaha_footprint_")
+
+    sampler = TreeSampler()
+    sampler.start()
+    results = {}
+    started = time.perf_counter()
+    threads = []
+    for worker_id in range(args.workers):
+        cities = [(f"Footprint {worker_id}-{i}", args.state) for i in range(1, args.cities + 1)]
+        thread = threading.Thread(
+            target=run_worker, args=(worker_id, cities, base_url, work_folder, headless, args, sampler, results)
+        )
+        thread.start()
+        threads.append(thread)
+    try:
+        for thread in threads:
+            thread.join()
+    finally:
+        elapsed = time.perf_counter() - started
+        sampler.stop()
+        server.shutdown()
+
+    workers = []
+    for worker_id in range(args.workers):
+        samples = sampler.rss.get(worker_id, [])
+        cpu = sampler.cpu.get(worker_id, 0.0)
+        workers.append({
+            "worker": worker_id,
+            "statuses": results.get(worker_id, {}).get("statuses", {}),
+            "browser_peak_mb": max(samples, default=0) / 2**20,
+            "browser_mean_mb": statistics.mean(samples) / 2**20 if samples else 0,
+            "cpu_s": cpu,
+            "cpu_pct": cpu / elapsed * 100 if elapsed else 0,
+        })
+    return {
+        "mode": "headless" if headless else "headed",
+        "elapsed_s": elapsed,
+        "python_peak_mb": max(sampler.python_rss, default=0) / 2**20,
+        "workers": workers,
+        "per_worker": {
+            key: statistics.mean(worker[key] for worker in workers) if workers else 0
+            for key in ("browser_peak_mb", "browser_mean_mb", "cpu_s", "cpu_pct")
+        },
+        "fingerprint": next((r["fingerprint"] for r in results.values() if r.get("fingerprint")), None),
+        "output_folder": work_folder,
+    }
+
+
+def has_display():
+    return platform.system() != "Linux" or bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+
+def print_report(runs):
+    print(f"\n{'mode':<10}{'worker':>8}{'peak MB':>10}{'mean MB':>10}{'CPU s':>9}{'CPU %':>8}  statuses")
+    for run in runs:
+        for worker in run["workers"]:
+            print(f"{run['mode']:<10}{worker['worker']:>8}{worker['browser_peak_mb']:>10.0f}{worker['browser_mean_mb']:>10.0f}"
+                  f"{worker['cpu_s']:>9.1f}{worker['cpu_pct']:>8.1f}  {worker['statuses']}")
+        per_worker = run["per_worker"]
+        print(f"{run['mode']:<10}{'mean':>8}{per_worker['browser_peak_mb']:>10.0f}{per_worker['browser_mean_mb']:>10.0f}"
+              f"{per_worker['cpu_s']:>9.1f}{per_worker['cpu_pct']:>8.1f}  ({run['elapsed_s']:.1f}s, "
+              f"python peak {run['python_peak_mb']:.0f} MB)")
+
+    by_mode = {run["mode"]: run for run in runs}
+    if "headed" in by_mode and "headless" in by_mode:
+        headed, headless = by_mode["headed"]["per_worker"], by_mode["headless"]["per_worker"]
+        for key, label in (("browser_peak_mb", "peak memory"), ("cpu_s", "CPU time")):
+            if headed[key]:
+                print(f"Headless {label} per worker : {headless[key] / headed[key] * 100:.0f}% of headed")
+        # The inner viewport legitimately differs, everything else should match
+        fingerprints = {mode: dict(run["fingerprint"] or {}) for mode, run in by_mode.items()}
+        for fingerprint in fingerprints.values():
+            fingerprint.pop("inner", None)
+            fingerprint.pop("outer", None)
+            fingerprint.pop("screen", None)
+        differences = {
+            key: (fingerprints["headed"].get(key), fingerprints["headless"].get(key))
+            for key in set(fingerprints["headed"]) | set(fingerprints["headless"])
+            if fingerprints["headed"].get(key) != fingerprints["headless"].get(key)
+        }
+        print(f"Fingerprint differences (headed, headless) : {differences or 'none'}")
+    for run in runs:
+        print(f"\n{run['mode']} fingerprint : {json.dumps(run['fingerprint'], indent=4)}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the per-worker footprint of headed and headless Chrome.")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--cities", type=int, default=3, help="cities per worker")
+    parser.add_argument("--state", default="TX")
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--sleep-scale", type=float, default=0.02, help="multiplier on the scraper's random sleeps")
+    parser.add_argument("--modes", nargs="+", choices=("headless", "headed"), default=["headless", "headed"])
+    parser.add_argument("--no-profile", action="store_true", help="headless without the fingerprint profile")
+    parser.add_argument("--json", help="also write the results to this file")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    runs = []
+    for mode in args.modes:
+        if mode == "headed" and not has_display():
+            print("No display found, skipping the headed run (use xvfb-run or set DISPLAY)")
+            continue
+        runs.append(run_mode(mode == "headless", args))
+    print_report(runs)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump({"config": vars(args), "runs": runs}, file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Local stand-in for the AAHA hospital locator, for offline benchmarks.
+
+Serves
+- /search/                            search form (hospitalLocatorSearchCriteria, radius,
+                                      city, stateProvince, __BVID__87/88, locator-search)
+- /search/?city=..&stateProvince=..   results page with `var locations` and recno-lookup anchors
+- /search/?recno=N                    hospital details page
+- /random/N                           tiny pages for visit_random_sites
+
+Hospitals come from one shared pool and each city gets a deterministic slice of it,
+so neighbouring searches overlap like they do on the real site.
+
+Usage : python benchmarks/mock_site.py [--port 8765] [--latency 0.2] [--verify-failure-rate 0.1]
+"""
+import json
+import time
+import random
+import zlib
+import argparse
+import threading
+from html import escape
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+POOL_SIZE = 400
+STREETS = ("Main St", "Oak Ave", "Elm St", "Maple Dr", "Cedar Rd", "Pine St", "Lake Blvd")
+PREFIXES = ("Northside", "Lakeview", "Oak Hill", "Riverbend", "Sunset", "Maple Grove", "Parkway", "Cedar Creek")
+DAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+def build_pool(seed=7):
+    rng = random.Random(seed)
+    pool = {}
+    for i in range(1, POOL_SIZE + 1):
+        recno = str(40000 + i)
+        pool[recno] = {
+            "recno": recno,
+            "name": f"{rng.choice(PREFIXES)} Animal Hospital {i}",
+            "address": f"{100 + i} {rng.choice(STREETS)}",
+            "phone": f"(555) 555-{1000 + i}",
+            "lat": round(30 + rng.uniform(-2, 2), 6),
+            "lng": round(-97 + rng.uniform(-2, 2), 6),
+            "icon": "Companion Animal",
+            "vets": [f"Dr. {rng.choice(['Ana', 'Ben', 'Cara', 'Dev', 'Eli'])} {rng.choice(['Smith', 'Lee', 'Patel'])}, DVM"
+                     for _ in range(rng.randint(1, 6))],
+            "species": rng.sample(["Dogs", "Cats", "Birds", "Rabbits", "Reptiles", "Ferrets"], 3),
+        }
+    return pool
+
+
+def page(body, scripts=""):
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>Find an AAHA-Accredited Animal Hospital Near Me</title></head>
+<body>
+<main id="app">
+{body}
+</main>
+{scripts}
+</body>
+</html>"""
+
+
+class MockSite:
+    """Page rendering plus the knobs the benchmark turns (latency, failures)."""
+    def __init__(self, latency=0.0, jitter=0.0, verify_failure_rate=0.0, empty_rate=0.05, per_city=(10, 30), seed=7,
+                 blocked_recnos=()):
+        self.latency = latency
+        self.jitter = jitter
+        self.verify_failure_rate = verify_failure_rate
+        self.empty_rate = empty_rate
+        self.per_city = per_city
+        # Details pages that always answer with the verification page
+        self.blocked_recnos = set(blocked_recnos)
+        self.pool = build_pool(seed)
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"search": 0, "results": 0, "verify_failures": 0, "details": 0, "random": 0}
+
+
+    def count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+
+    def chance(self, rate):
+        with self.lock:
+            return self.rng.random() < rate
+
+
+    def city_hospitals(self, city, state):
+        """Deterministic, overlapping slice of the pool for one city."""
+        seed = zlib.crc32(f"{city.strip().lower()}|{state.strip().lower()}".encode())
+        rng = random.Random(seed)
+        if rng.random() < self.empty_rate:
+            return []
+        start = rng.randrange(0, POOL_SIZE)
+        size = rng.randint(*self.per_city)
+        recnos = sorted(self.pool)
+        return [self.pool[recnos[(start + i) % POOL_SIZE]] for i in range(size)]
+
+
+    def search_page(self):
+        self.count("search")
+        return page("""<div id="hospitalLocatorSearchCriteria">
+  <form method="get" action="/search/">
+    <label>Radius <input type="text" name="radius" value="20"></label>
+    <label>City <input type="text" name="city" value=""></label>
+    <label>State/Province <input type="text" name="stateProvince" value=""></label>
+    <input type="radio" id="__BVID__87" name="country" value="United States" checked> United States
+    <input type="radio" id="__BVID__88" name="country" value="Canada"> Canada
+    <button id="locator-search" type="submit">Search</button>
+  </form>
+</div>""")
+
+
+    def results_page(self, city, state):
+        if self.chance(self.verify_failure_rate):
+            self.count("verify_failures")
+            return page('<div class="hospital-locator">Sorry, we could not verify your request. Please try again.</div>')
+        self.count("results")
+        hospitals = self.city_hospitals(city, state)
+        if not hospitals:
+            return page('<div class="hospital-locator">No hospitals found. Please refine your search criteria.</div>')
+
+        locations = [{"name": "Your Location", "lat": hospitals[0]["lat"], "lng": hospitals[0]["lng"]}]
+        items = []
+        for index, h in enumerate(hospitals):
+            distance = f"{(index * 0.7) % 20:.1f}"
+            locations.append({
+                "recno": h["recno"], "name": h["name"], "address": f"{h['address']}, {city}, {state}",
+                "phone": h["phone"], "lat": h["lat"], "lng": h["lng"], "distance": distance, "icon": h["icon"],
+            })
+            items.append(
+                f'<div class="hospital-result"><a class="recno-lookup" href="/search/?recno={h["recno"]}" '
+                f'data-recno="{h["recno"]}"><strong>{escape(h["name"])}</strong></a>'
+                f'<div class="distance">{distance} miles</div></div>'
+            )
+        body = f"""<div class="hospital-locator">
+  <div>You are here: {escape(city)}, {escape(state)}</div>
+  <div id="hospitalLocatorResults">
+    <div id="hospitalLocatorResultsList">
+{chr(10).join(items)}
+    </div>
+  </div>
+</div>"""
+        return page(body, f"<script>var locations = {json.dumps(locations)};</script>")
+
+
+    def details_page(self, recno):
+        if recno in self.blocked_recnos:
+            self.count("verify_failures")
+            return page('<div class="hospital-locator">Sorry, we could not verify your request. Please try again.</div>')
+        h = self.pool.get(recno)
+        if h is None:
+            return None
+        self.count("details")
+        vets = "".join(f"<li>{escape(v)}</li>" for v in h["vets"])
+        species = "".join(f"<li>{s}</li>" for s in h["species"])
+        hours = "".join(f"<tr><td>{d}</td><td>{'Closed' if d == 'Sunday' else '8:00 AM - 6:00 PM'}</td></tr>" for d in DAYS)
+        body = f"""<div class="hospital-locator">
+  <div id="hospitalLocatorDetailsAboveMap">
+    <div class="card"><div class="card-body"><h2>{escape(h['name'])}</h2><div>{escape(h['address'])}</div></div></div>
+    <div class="card"><div class="card-body">
+      <div>Phone: {h['phone']}</div>
+      <a href="https://www.example-vet-{recno}.com/">https://www.example-vet-{recno}.com/</a>
+      <a href="mailto:info@example-vet-{recno}.com">info@example-vet-{recno}.com</a>
+      <ul class="socials1-items"><li><a href="https://www.facebook.com/vet{recno}">Facebook</a></li></ul>
+    </div></div>
+  </div>
+  <div id="HospitalLocatorDetailsBelowMap">
+    <div class="card"><div class="card-header">Veterinarians</div><div class="card-body"><ul>{vets}</ul></div></div>
+    <div class="card"><div class="card-header">Species Treated</div><div class="card-body"><ul>{species}</ul></div></div>
+    <div class="card"><div class="card-header">Hospital Hours</div><div class="card-body"><table>{hours}</table></div></div>
+    <div class="card"><div class="card-header">Mission</div><div class="card-body"><p>Caring for {escape(h['name'])} patients.</p></div></div>
+  </div>
+</div>"""
+        return page(body)
+
+
+    def random_page(self, number):
+        self.count("random")
+        return page(f"<h1>Plain site {escape(number)}</h1><p>Nothing to see here.</p>")
+
+
+def make_handler(site):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def send_html(self, html, status=200):
+            data = html.encode('utf-8')
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if site.latency or site.jitter:
+                time.sleep(site.latency + random.uniform(0, site.jitter))
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            html = None
+            if url.path.startswith("/search"):
+                if "recno" in query:
+                    html = site.details_page(query["recno"])
+                elif "city" in query:
+                    html = site.results_page(query.get("city", ""), query.get("stateProvince", ""))
+                else:
+                    html = site.search_page()
+            elif url.path.startswith("/random/"):
+                html = site.random_page(url.path.rsplit("/", 1)[-1])
+            if html is None:
+                self.send_html(page("<h1>Not found</h1>"), status=404)
+            else:
+                self.send_html(html)
+    return Handler
+
+
+def start_server(site, host="127.0.0.1", port=0):
+    """Starts the mock site on a background thread. Returns (server, base_url)."""
+    server = ThreadingHTTPServer((host, port), make_handler(site))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local mock of the AAHA hospital locator.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random seconds per response")
+    parser.add_argument("--verify-failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    site = MockSite(latency=args.latency, jitter=args.jitter, verify_failure_rate=args.verify_failure_rate)
+    server, base_url = start_server(site, port=args.port)
+    print(f"Mock AAHA site on {base_url}/search/  (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
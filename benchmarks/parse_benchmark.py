@@ -0,0 +1,84 @@
+"""
+Parser benchmark : original html.parser path vs the fast lxml + SoupStrainer path.
+
+Runs both backends over saved pages (results_*.html / detail_*.html), reports
+parse time and peak Python memory per page, and fails if the records differ.
+
+Usage : python benchmarks/parse_benchmark.py [samples_folder] [repeat]
+"""
+import os
+import sys
+import time
+import tracemalloc
+import statistics
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from extractors import FAST_PARSER, parse_locations_json, parse_result_anchors, parse_hospital_details
+
+
+SAMPLES_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'samples')
+
+
+def extract(page_source, kind, fast):
+    """Same calls the scraper makes in soup mode, returned as comparable records."""
+    if kind == "results":
+        anchors = parse_result_anchors(page_source, fast=fast)
+        return {
+            "locations": parse_locations_json(page_source),
+            "hospitals": [(a.text.strip(), a.get("href"), a.get("data-recno")) for a in anchors],
+        }
+    return parse_hospital_details(page_source, fast=fast)
+
+
+def measure(page_source, kind, fast, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract(page_source, kind, fast)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    record = extract(page_source, kind, fast)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return record, statistics.median(timings), peak
+
+
+def main():
+    samples_folder = sys.argv[1] if len(sys.argv) > 1 else SAMPLES_FOLDER
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    files = sorted(f for f in os.listdir(samples_folder) if f.endswith(".html"))
+    if not files:
+        print(f"No .html samples in {samples_folder}")
+        sys.exit(1)
+
+    print(f"Fast backend : {FAST_PARSER} + SoupStrainer, {repeat} runs per page (median)\n")
+    print(f"{'page':<28}{'KB':>7}{'orig ms':>10}{'fast ms':>10}{'speedup':>9}{'orig peak KB':>14}{'fast peak KB':>14}  same")
+    mismatches = 0
+    totals = {False: 0.0, True: 0.0}
+    for file_name in files:
+        kind = "results" if file_name.startswith("results") else "detail"
+        with open(os.path.join(samples_folder, file_name), 'r', encoding='utf-8') as file:
+            page_source = file.read()
+
+        original, original_time, original_peak = measure(page_source, kind, fast=False, repeat=repeat)
+        fast, fast_time, fast_peak = measure(page_source, kind, fast=True, repeat=repeat)
+        same = original == fast
+        mismatches += not same
+        totals[False] += original_time
+        totals[True] += fast_time
+        print(
+            f"{file_name:<28}{len(page_source) / 1024:>7.0f}{original_time * 1000:>10.2f}{fast_time * 1000:>10.2f}"
+            f"{original_time / fast_time:>8.1f}x{original_peak / 1024:>14.0f}{fast_peak / 1024:>14.0f}  {'yes' if same else 'NO'}"
+        )
+
+    print(f"\nTotal : {totals[False] * 1000:.2f} ms -> {totals[True] * 1000:.2f} ms ({totals[False] / totals[True]:.1f}x)")
+    if mismatches:
+        print(f"{mismatches} page(s) produced different records!")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
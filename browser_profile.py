@@ -0,0 +1,147 @@
+"""
+One consistent browser fingerprint per driver, so headless Chrome presents
+the same machine as the headed one.
+
+Headless Chrome gives itself away in places the `user-agent` switch does not
+reach: the "HeadlessChrome" brand in the client hints (`sec-ch-ua`,
+`navigator.userAgentData`), the host OS in `sec-ch-ua-platform`, SwiftShader
+as the WebGL renderer, an 800x600 screen and a zero-sized outer window. A
+profile fixes all of them to one desktop, and its user agent follows the
+major version of the Chrome that is actually running.
+"""
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+PROFILES = {
+    "windows": {
+        "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                      "(KHTML, like Gecko) Chrome/{major}.0.0.0 Safari/537.36",
+        "platform": "Win32",
+        "ua_platform": "Windows",
+        "platform_version": "10.0.0",
+        "architecture": "x86",
+        "bitness": "64",
+        "vendor": "Google Inc.",
+        "webgl_vendor": "Google Inc. (Intel)",
+        "renderer": "ANGLE (Intel, Intel(R) UHD Graphics 630 (0x00003E9B) Direct3D11 vs_5_0 ps_5_0, D3D11)",
+        "hardware_concurrency": 8,
+        "device_memory": 8,
+        "screen": (1920, 1080),
+        "taskbar": 40,
+    },
+    "chromeos": {
+        "user_agent": "Mozilla/5.0 (X11; CrOS x86_64 14541.0.0) AppleWebKit/537.36 "
+                      "(KHTML, like Gecko) Chrome/{major}.0.0.0 Safari/537.36",
+        "platform": "Linux x86_64",
+        "ua_platform": "Chrome OS",
+        "platform_version": "14541.0.0",
+        "architecture": "x86",
+        "bitness": "64",
+        "vendor": "Google Inc.",
+        "webgl_vendor": "Google Inc. (Intel)",
+        "renderer": "ANGLE (Intel, Mesa Intel(R) UHD Graphics 620 (KBL GT2), OpenGL 4.6)",
+        "hardware_concurrency": 4,
+        "device_memory": 8,
+        "screen": (1366, 768),
+        "taskbar": 48,
+    },
+}
+
+LANGUAGES = ["en-US", "en"]
+
+
+def user_agent(profile, browser_version):
+    major = str(browser_version).split(".")[0]
+    return profile["user_agent"].format(major=major)
+
+
+def brands(browser_version, full=False):
+    """Brand list the way Chrome orders it, with the GREASE entry."""
+    version = str(browser_version) if full else str(browser_version).split(".")[0]
+    return [
+        {"brand": "Chromium", "version": version},
+        {"brand": "Google Chrome", "version": version},
+        {"brand": "Not:A-Brand", "version": "99.0.0.0" if full else "99"},
+    ]
+
+
+def user_agent_override(profile, browser_version):
+    """Params for Emulation/Network.setUserAgentOverride, client hints included."""
+    return {
+        "userAgent": user_agent(profile, browser_version),
+        "acceptLanguage": ",".join(LANGUAGES),
+        "platform": profile["platform"],
+        "userAgentMetadata": {
+            "brands": brands(browser_version),
+            "fullVersionList": brands(browser_version, full=True),
+            "fullVersion": str(browser_version),
+            "platform": profile["ua_platform"],
+            "platformVersion": profile["platform_version"],
+            "architecture": profile["architecture"],
+            "bitness": profile["bitness"],
+            "model": "",
+            "mobile": False,
+            "wow64": False,
+        },
+    }
+
+
+def init_script(profile, headless=False):
+    """
+    `navigator` overrides injected before any page script runs (platform,
+    languages, vendor and WebGL are left to selenium-stealth, fed from the same
+    profile). In headless mode the screen and outer window are sized like a
+    maximized desktop window.
+    """
+    source = f"""
+        Object.defineProperty(navigator, 'webdriver', {{get: () => undefined}});
+        Object.defineProperty(navigator, 'hardwareConcurrency', {{get: () => {profile["hardware_concurrency"]}}});
+        Object.defineProperty(navigator, 'deviceMemory', {{get: () => {profile["device_memory"]}}});
+    """
+    if headless:
+        width, height = profile["screen"]
+        source += f"""
+        for (const [key, value] of Object.entries({{
+            width: {width}, height: {height}, availWidth: {width}, availHeight: {height - profile["taskbar"]},
+            colorDepth: 24, pixelDepth: 24,
+        }})) {{
+            Object.defineProperty(Screen.prototype, key, {{get: () => value}});
+        }}
+        Object.defineProperty(window, 'outerWidth', {{get: () => window.innerWidth}});
+        Object.defineProperty(window, 'outerHeight', {{get: () => window.innerHeight + 85}});
+        Object.defineProperty(window, 'screenX', {{get: () => 0}});
+        Object.defineProperty(window, 'screenY', {{get: () => 0}});
+        """
+    return source
+
+
+def window_size(profile):
+    """Headless window : the screen minus the taskbar, like a maximized window."""
+    width, height = profile["screen"]
+    return width, height - profile["taskbar"]
+
+
+# What a bot check would read, to compare headed and headless sessions
+FINGERPRINT_JS = """
+    var gl = document.createElement('canvas').getContext('webgl');
+    var debug = gl && gl.getExtension('WEBGL_debug_renderer_info');
+    var data = navigator.userAgentData;
+    return {
+        userAgent: navigator.userAgent,
+        platform: navigator.platform,
+        languages: navigator.languages,
+        webdriver: navigator.webdriver,
+        hardwareConcurrency: navigator.hardwareConcurrency,
+        deviceMemory: navigator.deviceMemory,
+        brands: data ? data.brands.map(b => b.brand + ' ' + b.version) : null,
+        uaPlatform: data ? data.platform : null,
+        webglVendor: debug ? gl.getParameter(debug.UNMASKED_VENDOR_WEBGL) : null,
+        webglRenderer: debug ? gl.getParameter(debug.UNMASKED_RENDERER_WEBGL) : null,
+        screen: [screen.width, screen.height, screen.availWidth, screen.availHeight],
+        outer: [window.outerWidth, window.outerHeight],
+        inner: [window.innerWidth, window.innerHeight],
+        plugins: navigator.plugins.length,
+    };
+"""
@@ -0,0 +1,333 @@
+"""
+Async Chrome DevTools Protocol backend (websockets), for driving many pages
+from one event loop instead of one blocking WebDriver round trip at a time.
+
+It can attach to the Chrome that Selenium already started (same cookies,
+proxy extension and stealth patches, see `CDPBrowser.attach`) or launch its
+own (`launch_chrome`). Pages expose the operations the scraper needs:
+navigate, wait_for_selector, evaluate, click, fill, content.
+Scripts use the Selenium `execute_script` convention (a function body with a
+top-level `return` and `arguments`), so RESULTS_JS / DETAILS_JS run unchanged.
+"""
+import os
+import json
+import time
+import shutil
+import asyncio
+import logging
+import platform
+import tempfile
+import subprocess
+import urllib.request
+
+import websockets
+
+
+logger = logging.getLogger(__name__)
+
+
+class CDPError(Exception):
+    pass
+
+
+class CDPConnection:
+    """One browser-level websocket; page sessions are multiplexed on it (flatten mode)."""
+    def __init__(self, ws_url):
+        self.ws_url = ws_url
+        self.ws = None
+        self.reader = None
+        self.next_id = 0
+        self.pending = {}
+        self.waiters = {}
+
+
+    async def connect(self):
+        self.ws = await websockets.connect(self.ws_url, max_size=None)
+        self.reader = asyncio.create_task(self._read())
+
+
+    async def _read(self):
+        try:
+            async for raw in self.ws:
+                message = json.loads(raw)
+                if "id" in message:
+                    future = self.pending.pop(message["id"], None)
+                    if future is None or future.done():
+                        continue
+                    if "error" in message:
+                        future.set_exception(CDPError(message["error"].get("message", str(message["error"]))))
+                    else:
+                        future.set_result(message.get("result", {}))
+                else:
+                    for future in self.waiters.pop((message.get("sessionId"), message.get("method")), []):
+                        if not future.done():
+                            future.set_result(message.get("params", {}))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(CDPError("DevTools connection closed"))
+
+
+    async def send(self, method, params=None, session_id=None, timeout=60):
+        self.next_id += 1
+        message = {"id": self.next_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        future = asyncio.get_running_loop().create_future()
+        self.pending[self.next_id] = future
+        await self.ws.send(json.dumps(message))
+        return await asyncio.wait_for(future, timeout)
+
+
+    def expect(self, method, session_id=None):
+        """Future for the next `method` event; register it before triggering the event."""
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.setdefault((session_id, method), []).append(future)
+        return future
+
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+        if self.reader is not None:
+            await self.reader
+
+
+class CDPPage:
+    """One tab, attached through its own session id."""
+    def __init__(self, connection, target_id, session_id):
+        self.connection = connection
+        self.target_id = target_id
+        self.session_id = session_id
+
+
+    async def send(self, method, params=None, timeout=60):
+        return await self.connection.send(method, params, session_id=self.session_id, timeout=timeout)
+
+
+    async def navigate(self, url, wait_until="domcontentloaded", timeout=60):
+        """Loads `url` and waits for DOMContentLoaded ("domcontentloaded") or the load event ("load")."""
+        event = "Page.loadEventFired" if wait_until == "load" else "Page.domContentEventFired"
+        loaded = self.connection.expect(event, self.session_id)
+        result = await self.send("Page.navigate", {"url": url}, timeout=timeout)
+        if result.get("errorText"):
+            raise CDPError(f"Navigation to {url} failed: {result['errorText']}")
+        await asyncio.wait_for(loaded, timeout)
+
+
+    async def evaluate(self, script, *args, timeout=60):
+        """Runs `script` like Selenium's execute_script and returns its JSON value."""
+        expression = f"(function() {{\n{script}\n}}).apply(null, {json.dumps(list(args))})"
+        result = await self.send("Runtime.evaluate", {
+            "expression": expression, "returnByValue": True, "awaitPromise": True,
+        }, timeout=timeout)
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            raise CDPError(details.get("exception", {}).get("description") or details.get("text", "script error"))
+        return result.get("result", {}).get("value")
+
+
+    async def wait_for_selector(self, selector, timeout=20, text=None, interval=0.1):
+        """Waits until `selector` matches (and its text contains one of `text`, if given). Returns its text."""
+        deadline = time.monotonic() + timeout
+        markers = [text] if isinstance(text, str) else list(text or [])
+        while True:
+            found = await self.evaluate(
+                "var el = document.querySelector(arguments[0]); return el ? el.innerText || el.textContent || '' : null;",
+                selector,
+            )
+            if found is not None and (not markers or any(marker in found for marker in markers)):
+                return found
+            if time.monotonic() > deadline:
+                raise asyncio.TimeoutError(f"Timed out waiting for {selector}")
+            await asyncio.sleep(interval)
+
+
+    async def click(self, selector):
+        """Scrolls the element into view and clicks its centre with real mouse events."""
+        box = await self.evaluate("""
+            var el = document.querySelector(arguments[0]);
+            if (!el) return null;
+            el.scrollIntoView({block: 'center', inline: 'nearest'});
+            var r = el.getBoundingClientRect();
+            return {x: r.left + r.width / 2, y: r.top + r.height / 2};
+        """, selector)
+        if box is None:
+            raise CDPError(f"No element matches {selector}")
+        for event in ("mouseMoved", "mousePressed", "mouseReleased"):
+            await self.send("Input.dispatchMouseEvent", {
+                "type": event, "x": box["x"], "y": box["y"], "button": "left", "clickCount": 1,
+            })
+
+
+    async def fill(self, selector, value):
+        """Focuses and clears the field, then types `value` as one text input."""
+        focused = await self.evaluate("""
+            var el = document.querySelector(arguments[0]);
+            if (!el) return false;
+            el.focus(); el.value = '';
+            el.dispatchEvent(new Event('input', {bubbles: true}));
+            return true;
+        """, selector)
+        if not focused:
+            raise CDPError(f"No element matches {selector}")
+        await self.send("Input.insertText", {"text": str(value)})
+
+
+    async def content(self):
+        return await self.evaluate("return document.documentElement.outerHTML;")
+
+
+    async def close(self):
+        await self.connection.send("Target.closeTarget", {"targetId": self.target_id})
+
+
+class CDPBrowser:
+    def __init__(self, connection, process=None, user_data_dir=None):
+        self.connection = connection
+        self.process = process
+        self.user_data_dir = user_data_dir
+
+
+    @classmethod
+    async def connect(cls, ws_url, **kwargs):
+        connection = CDPConnection(ws_url)
+        await connection.connect()
+        return cls(connection, **kwargs)
+
+
+    @classmethod
+    async def attach(cls, debugger_address):
+        """Attaches to a running Chrome, e.g. Selenium's `goog:chromeOptions.debuggerAddress`."""
+        def version():
+            with urllib.request.urlopen(f"http://{debugger_address}/json/version", timeout=10) as response:
+                return json.load(response)
+        info = await asyncio.get_running_loop().run_in_executor(None, version)
+        return await cls.connect(info["webSocketDebuggerUrl"])
+
+
+    @classmethod
+    async def launch(cls, headless=True, binary=None, args=()):
+        process, ws_url, user_data_dir = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: launch_chrome(headless=headless, binary=binary, args=args)
+        )
+        return await cls.connect(ws_url, process=process, user_data_dir=user_data_dir)
+
+
+    async def new_page(self, blocked_urls=None, user_agent_override=None, init_script=None):
+        """
+        Opens a tab. CDP state is per tab, so resource blocking, the user agent
+        override (with client hints) and the init script are set on each one.
+        """
+        target = await self.connection.send("Target.createTarget", {"url": "about:blank"})
+        attached = await self.connection.send("Target.attachToTarget", {"targetId": target["targetId"], "flatten": True})
+        page = CDPPage(self.connection, target["targetId"], attached["sessionId"])
+        await page.send("Page.enable")
+        if blocked_urls:
+            await page.send("Network.enable")
+            await page.send("Network.setBlockedURLs", {"urls": list(blocked_urls)})
+        if user_agent_override:
+            await page.send("Emulation.setUserAgentOverride", user_agent_override)
+        if init_script:
+            await page.send("Page.addScriptToEvaluateOnNewDocument", {"source": init_script})
+        return page
+
+
+    async def close(self):
+        if self.process is not None:
+            try:
+                await self.connection.send("Browser.close", timeout=10)
+            except Exception:
+                self.process.terminate()
+        await self.connection.close()
+        if self.user_data_dir:
+            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+
+def find_chrome():
+    if platform.system() == "Darwin":
+        path = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
+        if os.path.exists(path):
+            return path
+    for name in ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome", "chrome.exe"):
+        path = shutil.which(name)
+        if path:
+            return path
+    raise FileNotFoundError("No Chrome/Chromium binary found in PATH")
+
+
+def launch_chrome(headless=True, binary=None, args=(), timeout=30):
+    """Starts Chrome with a DevTools port. Returns (process, browser websocket url, profile dir)."""
+    user_data_dir = tempfile.mkdtemp(prefix="aaha_cdp_")
+    command = [
+        binary or find_chrome(), "--remote-debugging-port=0", f"--user-data-dir={user_data_dir}",
+        "--no-first-run", "--no-default-browser-check", "--disable-blink-features=AutomationControlled",
+        *(["--headless=new"] if headless else []), *args, "about:blank",
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        line = process.stderr.readline()
+        if "DevTools listening on" in line:
+            return process, line.split("DevTools listening on", 1)[1].strip(), user_data_dir
+        if not line and process.poll() is not None:
+            break
+    process.kill()
+    raise CDPError("Chrome did not report a DevTools endpoint")
+
+
+async def fetch_pages(browser, jobs, pages=4, ready_selector="#hospitalLocatorDetailsAboveMap", script=None,
+                      blocked_urls=None, pacer=None, timeout=60, user_agent_override=None, init_script=None,
+                      on_page=None, on_wait=None):
+    """
+    Loads every (name, url) of `jobs` with up to `pages` tabs in flight.
+    Returns {name: (html, script result)}. A page whose `ready_selector` never
+    shows up maps to (html, {"error": ...}), pages that fail to load map to None.
+    `pacer` (a RateController) is asked before every navigation.
+    `user_agent_override` / `init_script` give every tab the browser profile (see browser_profile).
+    `on_page(name, result)` is called as soon as each page is done, so callers can checkpoint per page.
+    `on_wait(seconds)` is told how long the pacer held each navigation back.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    for job in jobs:
+        queue.put_nowait(job)
+    results = {}
+
+    async def worker():
+        page = await browser.new_page(
+            blocked_urls=blocked_urls, user_agent_override=user_agent_override, init_script=init_script
+        )
+        try:
+            while not queue.empty():
+                name, url = queue.get_nowait()
+                try:
+                    if pacer is not None:
+                        waited = await loop.run_in_executor(None, pacer.acquire)
+                        if on_wait is not None:
+                            on_wait(waited)
+                    await page.navigate(url, timeout=timeout)
+                    try:
+                        await page.wait_for_selector(ready_selector, timeout=timeout)
+                    except asyncio.TimeoutError as e:
+                        # Keep what did load (e.g. the verification page) so the caller can tell a block from a slow page
+                        logger.error(f"CDP page not ready for {name}: {e}")
+                        results[name] = (await page.content(), {"error": str(e)})
+                    else:
+                        value = await page.evaluate(script) if script else None
+                        results[name] = (await page.content(), value)
+                except Exception as e:
+                    logger.error(f"CDP page failed for {name}: {type(e).__name__} {e}")
+                    results[name] = None
+                if on_page is not None:
+                    on_page(name, results[name])
+        finally:
+            try:
+                await page.close()
+            except Exception:
+                pass
+
+    await asyncio.gather(*(worker() for _ in range(max(1, min(pages, len(jobs))))))
+    return results
@@ -0,0 +1,143 @@
+"""
+Plans fewer, better placed searches from what earlier runs already saw.
+
+The locator only searches around a City/State, so every search is centred on
+one of the input cities. For cities the locations store already has (their
+"Your Location" point and the hospitals around them), the planner greedily
+picks (city, radius) searches until every known hospital and every city centre
+is inside one of them (near-minimal set cover). A radius is only allowed where
+it would return at most `max_results` known hospitals, so dense areas get
+several small searches and sparse areas one wide one. Cities without known
+coordinates are searched as before.
+
+Centres are never geocoded: the input sheet has only City/State, so a city
+needs one earlier search before the planner can place it. A first run over a
+fresh sheet gets no reduction.
+"""
+import math
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_MILES = 3958.8
+
+
+def haversine_miles(a, b):
+    lat1, lng1, lat2, lng2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(h))
+
+
+def _point(location):
+    try:
+        return float(location["lat"]), float(location["lng"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def known_geometry(records):
+    """
+    From locations store records: ({(city, state): (lat, lng)}, {hospital id: (lat, lng)}).
+    Newer records win for a city's centre.
+    """
+    centers, hospitals = {}, {}
+    for record in records:
+        city_key = (str(record.get("city", "")).strip().lower(), str(record.get("state", "")).strip().lower())
+        for location in record.get("locations") or []:
+            point = _point(location)
+            if point is None:
+                continue
+            if "Your Location" in location.get("name", ""):
+                centers[city_key] = point
+            else:
+                hospital_id = location.get("recno") or f"{location.get('name', '')}|{point[0]:.5f}|{point[1]:.5f}"
+                hospitals[hospital_id] = point
+    return centers, hospitals
+
+
+class SearchPlan:
+    """
+    searches : [(city, state, radius, covers)] to run, in input order, where
+               `covers` lists the other (city, state) rows that search makes redundant
+    """
+    def __init__(self, searches):
+        self.searches = searches
+
+
+    def __len__(self):
+        return len(self.searches)
+
+
+    def covered_count(self):
+        return sum(len(covers) for _, _, _, covers in self.searches)
+
+
+def plan_searches(cities, centers, hospitals, radii=(5, 10, 20, 30, 50), default_radius=20, max_results=50):
+    """
+    cities    : [(city, state)] still to search, in input order
+    centers   : {(city, state) lower-cased: (lat, lng)} from known_geometry
+    hospitals : {hospital id: (lat, lng)} from known_geometry
+    """
+    known = [(city, state) for city, state in cities if (city.strip().lower(), state.strip().lower()) in centers]
+    point_of = {row: centers[(row[0].strip().lower(), row[1].strip().lower())] for row in known}
+
+    # Only hospitals near the cities being planned matter
+    reach = max(radii)
+    targets = {
+        hospital_id: point for hospital_id, point in hospitals.items()
+        if any(haversine_miles(point, center) <= reach for center in point_of.values())
+    }
+    universe = {("city", row) for row in known} | {("hospital", hospital_id) for hospital_id in targets}
+
+    candidates = []
+    for row in known:
+        center = point_of[row]
+        hospital_distances = {("hospital", h): haversine_miles(center, point) for h, point in targets.items()}
+        city_distances = {("city", other): haversine_miles(center, point_of[other]) for other in known}
+        for radius in sorted(radii):
+            covered_hospitals = {item for item, distance in hospital_distances.items() if distance <= radius}
+            if len(covered_hospitals) > max_results:
+                # Would hit "Please refine your search criteria", smaller searches have to cover this
+                break
+            covered_cities = {item for item, distance in city_distances.items() if distance <= radius}
+            candidates.append((row, radius, covered_hospitals | covered_cities))
+
+    # Greedy set cover: most new items per search, the smaller radius on ties
+    chosen = {}
+    uncovered = set(universe)
+    while uncovered:
+        best = max(candidates, key=lambda c: (len(c[2] & uncovered), -c[1]), default=None)
+        if best is None or not best[2] & uncovered:
+            break
+        row, radius, items = best
+        chosen[row] = max(radius, chosen.get(row, 0))
+        uncovered -= items
+
+    # Every remaining city is assigned to the nearest chosen search that reaches it, or searched itself
+    covers = {row: [] for row in chosen}
+    for row in known:
+        if row in chosen:
+            continue
+        reaching = [
+            center_row for center_row, radius in chosen.items()
+            if haversine_miles(point_of[center_row], point_of[row]) <= radius
+        ]
+        if reaching:
+            owner = min(reaching, key=lambda center_row: haversine_miles(point_of[center_row], point_of[row]))
+            covers[owner].append(row)
+        else:
+            chosen[row] = min(radii)
+            covers[row] = []
+
+    searches = []
+    for city, state in cities:
+        row = (city, state)
+        if row in chosen:
+            searches.append((city, state, chosen[row], covers[row]))
+        elif row not in point_of:
+            searches.append((city, state, default_radius, []))
+    plan = SearchPlan(searches)
+    logger.info(f"Coverage plan : {len(plan)} searches for {len(cities)} cities "
+                f"({len(known)} with known coordinates, {plan.covered_count()} covered by neighbours)")
+    return plan
@@ -0,0 +1,213 @@
+import re
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    FAST_PARSER = "lxml"
+except ImportError:
+    FAST_PARSER = "html.parser"
+
+
+LOCATIONS_PATTERN = re.compile(r"var locations\s*=\s*(\[[\s\S]*?\]);")
+RESULTS_SECTIONS = ("hospitalLocatorResultsList",)
+DETAILS_SECTIONS = ("hospitalLocatorDetailsAboveMap", "HospitalLocatorDetailsBelowMap")
+
+
+def make_soup(page_source, sections, fast=False):
+    """
+    fast=False : full document with the stdlib "html.parser" (original behaviour).
+    fast=True  : lxml (when installed) and only the subtrees whose id is in `sections`.
+    """
+    if not fast:
+        return BeautifulSoup(page_source, "html.parser")
+    return BeautifulSoup(page_source, FAST_PARSER, parse_only=SoupStrainer(id=list(sections)))
+
+
+# ----------------------------------------------------------------------------
+# HTML (BeautifulSoup) extractors - work on a full page source string
+# ----------------------------------------------------------------------------
+
+def parse_locations_json(page_source):
+    """Returns the raw JSON text of `var locations = [...]`, or None."""
+    match = LOCATIONS_PATTERN.search(page_source)
+    return match.group(1) if match else None
+
+
+def parse_result_anchors(page_source, fast=False):
+    """Returns the `recno-lookup` anchors of the results list."""
+    results_soup = make_soup(page_source, RESULTS_SECTIONS, fast=fast)
+    return results_soup.find("div", id="hospitalLocatorResultsList").find_all(class_='recno-lookup')
+
+
+def parse_hospital_details(page_source, fast=False):
+    """
+    Extracts website, phone, email, socials, vets, species, hours and mission
+    from a hospital details page. Raises if one of the two sections is missing.
+    """
+    details = {}
+    hospital_details_soup = make_soup(page_source, DETAILS_SECTIONS, fast=fast)
+
+    # Step 1: Extract from hospitalLocatorDetailsAboveMap
+    above_map = hospital_details_soup.find("div", id="hospitalLocatorDetailsAboveMap")
+    contact_card_body = above_map.find_all('div', class_='card-body')[-1] if above_map else None
+    if not contact_card_body:
+        raise Exception("No 'hospitalLocatorDetailsAboveMap' section found.")
+    else:
+        try:
+            website_element = contact_card_body.find('a', href=True, string=lambda x: x and ':' in x)
+            details["Website"] = website_element["href"].strip() if website_element else "N/A"
+        except AttributeError:
+            details["Website"] = "N/A"
+        try:
+            phone_element = contact_card_body.find('div', string=lambda x: x and 'Phone' in x)
+            details["Phone"] = phone_element.text.strip().split(":")[-1].strip() if phone_element else "N/A"
+        except AttributeError:
+            details["Phone"] = "N/A"
+        try:
+            email_element = contact_card_body.find('a', href=lambda href: href and "mailto:" in href)
+            details["Email"] = email_element["href"].replace("mailto:", "").strip() if email_element else "N/A"
+        except AttributeError:
+            details["Email"] = "N/A"
+        try:
+            social_links = contact_card_body.select("ul.socials1-items a")
+            details["Social Media"] = {link.text.strip(): link["href"].strip() for link in social_links} if social_links else {}
+        except AttributeError:
+            details["Social Media"] = {}
+
+    # Step 2: Extract from HospitalLocatorDetailsBelowMap
+    below_map = hospital_details_soup.find("div", id="HospitalLocatorDetailsBelowMap")
+    if not below_map:
+        raise Exception("No 'HospitalLocatorDetailsBelowMap' section found.")
+    else:
+        below_cards = below_map.find_all(class_="card")
+        for card in below_cards:
+            try:
+                title_element = card.find(class_="card-header")
+                title = title_element.text.strip() if title_element else "N/A"
+                if title in ('Veterinarians', 'Species Treated'):
+                    ul_element = card.find_next("ul")
+                    details[title] = [li.text.strip() for li in ul_element.find_all("li")] if ul_element else []
+                elif title == 'Hospital Hours':
+                    hours_table = card.find("table")
+                    if hours_table:
+                        details[title] = {}
+                        for row in hours_table.find_all("tr"):
+                            cells = row.find_all("td")
+                            details[title][cells[0].text.strip()] = cells[1].text.strip()
+                    else:
+                        details[title] = {}
+                elif title == "Mission":
+                    mission_text = card.find_next("p")
+                    details[title] = mission_text.text.strip() if mission_text else "N/A"
+            except AttributeError:
+                continue
+    return details
+
+
+# ----------------------------------------------------------------------------
+# In-browser extractors - run through driver.execute_script, so only the
+# compact result crosses the WebDriver wire instead of the whole page source.
+# They mirror the BeautifulSoup logic above field for field.
+# ----------------------------------------------------------------------------
+
+RESULTS_JS = r"""
+var hospitals = [];
+var list = document.getElementById('hospitalLocatorResultsList');
+if (list) {
+    list.querySelectorAll('.recno-lookup').forEach(function (anchor) {
+        hospitals.push({
+            'name': anchor.textContent.trim(),
+            'href': anchor.getAttribute('href'),
+            'data-recno': anchor.getAttribute('data-recno'),
+            'recno': anchor.getAttribute('recno'),
+            'data-id': anchor.getAttribute('data-id')
+        });
+    });
+}
+var locs = null;
+try {
+    if (typeof locations !== 'undefined' && Array.isArray(locations)) {
+        locs = JSON.parse(JSON.stringify(locations));
+    }
+} catch (e) {
+    locs = null;
+}
+return {'locations': locs, 'hospitals': hospitals};
+"""
+
+DETAILS_JS = r"""
+function tagString(el) {
+    // Same as BeautifulSoup's `.string`: the text of a single-child chain
+    while (el && el.childNodes.length === 1) {
+        var child = el.childNodes[0];
+        if (child.nodeType === Node.TEXT_NODE) return child.nodeValue;
+        if (child.nodeType !== Node.ELEMENT_NODE) return null;
+        el = child;
+    }
+    return null;
+}
+function findNext(el, tag) {
+    var all = document.getElementsByTagName(tag);
+    for (var i = 0; i < all.length; i++) {
+        if (el.compareDocumentPosition(all[i]) & Node.DOCUMENT_POSITION_FOLLOWING) return all[i];
+    }
+    return null;
+}
+function text(el) { return el.textContent.trim(); }
+
+var details = {};
+var aboveMap = document.getElementById('hospitalLocatorDetailsAboveMap');
+var bodies = aboveMap ? aboveMap.querySelectorAll('div.card-body') : [];
+var contact = bodies.length ? bodies[bodies.length - 1] : null;
+if (!contact) return {'error': "No 'hospitalLocatorDetailsAboveMap' section found."};
+
+var website = Array.from(contact.querySelectorAll('a[href]')).find(function (a) {
+    var s = tagString(a); return s && s.indexOf(':') !== -1;
+});
+details['Website'] = website ? website.getAttribute('href').trim() : 'N/A';
+
+var phone = Array.from(contact.querySelectorAll('div')).find(function (div) {
+    var s = tagString(div); return s && s.indexOf('Phone') !== -1;
+});
+details['Phone'] = phone ? text(phone).split(':').pop().trim() : 'N/A';
+
+var email = Array.from(contact.querySelectorAll('a[href]')).find(function (a) {
+    return a.getAttribute('href').indexOf('mailto:') !== -1;
+});
+details['Email'] = email ? email.getAttribute('href').replace(/mailto:/g, '').trim() : 'N/A';
+
+var socials = {};
+contact.querySelectorAll('ul.socials1-items a').forEach(function (a) {
+    socials[text(a)] = (a.getAttribute('href') || '').trim();
+});
+details['Social Media'] = socials;
+
+var belowMap = document.getElementById('HospitalLocatorDetailsBelowMap');
+if (!belowMap) return {'error': "No 'HospitalLocatorDetailsBelowMap' section found."};
+var cards = belowMap.querySelectorAll('.card');
+for (var i = 0; i < cards.length; i++) {
+    var card = cards[i];
+    var header = card.querySelector('.card-header');
+    var title = header ? text(header) : 'N/A';
+    if (title === 'Veterinarians' || title === 'Species Treated') {
+        var ul = findNext(card, 'ul');
+        details[title] = ul ? Array.from(ul.getElementsByTagName('li')).map(text) : [];
+    } else if (title === 'Hospital Hours') {
+        var table = card.querySelector('table');
+        var hours = {};
+        if (table) {
+            var rows = table.getElementsByTagName('tr');
+            for (var r = 0; r < rows.length; r++) {
+                var cells = rows[r].getElementsByTagName('td');
+                if (cells.length < 2) return {'error': 'Unexpected row in hospital hours table.'};
+                hours[text(cells[0])] = text(cells[1]);
+            }
+        }
+        details[title] = hours;
+    } else if (title === 'Mission') {
+        var p = findNext(card, 'p');
+        details[title] = p ? text(p) : 'N/A';
+    }
+}
+return details;
+"""
@@ -0,0 +1,215 @@
+"""
+Runs the scraper on several nodes against one shared job store. Cities are
+leased, not assigned: every worker claims the next pending city, heartbeats
+while it scrapes and records the outcome. A node that dies stops heartbeating,
+its lease runs out and another node picks the city up, until `--max-attempts`.
+
+Usage:
+    python fleet.py seed   [--db PATH]            import input/*input.xlsx into the store
+    python fleet.py work   [--db PATH] [--headless] [--processes N] [--wait]
+    python fleet.py status [--db PATH]
+    python fleet.py export [--db PATH]            write statuses back into the input workbook
+    python fleet.py refresh [--db PATH] [--country NAME] [--older-than DAYS]
+                                                  queue done cities again for a refresh run
+
+Point every node's --db at the same file (use --no-wal when it lives on a
+network share), then start `work` on as many nodes as you like. `refresh` only
+clears the search cache of the node it runs on, so start the other nodes'
+refresh workers with `work --no-search-cache`.
+"""
+import os
+import time
+import logging
+import argparse
+import platform
+import threading
+import multiprocessing as mp
+import pandas as pd
+
+from state_store import JobStore
+from utils import get_input_files
+from metrics import report_file
+from pacing import shared_state
+from scraper import AahaScraper, STATE_DB_PATH, PACING
+
+
+logger = logging.getLogger(__name__)
+
+
+class Heartbeat(threading.Thread):
+    """Keeps extending one city's lease while it is being scraped."""
+    def __init__(self, job_store, owner, job, lease_seconds):
+        super().__init__(daemon=True)
+        self.job_store = job_store
+        self.owner = owner
+        self.job = job
+        self.lease_seconds = lease_seconds
+        self.stopped = threading.Event()
+        self.lost = False
+
+
+    def run(self):
+        country, _, city, state = self.job
+        while not self.stopped.wait(self.lease_seconds / 3):
+            try:
+                if not self.job_store.heartbeat(self.owner, country, city, state, self.lease_seconds):
+                    self.lost = True
+                    logger.warning(f"[{self.owner}] Lost the lease on {city}, {state}")
+                    return
+            except Exception as e:
+                logger.warning(f"[{self.owner}] Heartbeat failed for {city}, {state}: {e}")
+
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def work(db_path, owner, headless=False, lease_seconds=900, max_attempts=3, wait=False, wal=True, file_lock=None,
+         search_cache=True, pacing_state=None, recycle_on_refresh=False):
+    """
+    Claims and scrapes cities until the store has none left (or forever with `wait`).
+    `file_lock` is shared by the worker processes of one node for the output files,
+    `pacing_state` gives them one navigation budget (see pacing.shared_state).
+    """
+    job_store = JobStore(db_path, wal=wal)
+    aaha_scraper = AahaScraper(file_lock=file_lock, pacing_state=pacing_state)
+    aaha_scraper.headless = headless
+    aaha_scraper.read_search_cache = search_cache
+    if recycle_on_refresh:
+        aaha_scraper.sessions.recycle_on_refresh = True
+    aaha_scraper.job_store = job_store
+    processed = 0
+    try:
+        while True:
+            job = job_store.claim(owner, lease_seconds=lease_seconds, max_attempts=max_attempts)
+            if job is None:
+                if not wait:
+                    break
+                time.sleep(30)
+                continue
+            country, index, city, state = job
+            logger.info(f"[{owner}] {index + 1}. --> {city}, {state} ({country})")
+
+            heartbeat = Heartbeat(job_store, owner, job, lease_seconds)
+            heartbeat.start()
+            error = None
+            try:
+                data_status = aaha_scraper.scrape_city(country=country, city=city, state=state)
+                error = aaha_scraper.last_error
+            except Exception as e:
+                logger.error(f"[{owner}] Error while processing {city}, {state}: {e}")
+                data_status = "error"
+                error = f"{type(e).__name__}: {e}"
+            finally:
+                heartbeat.stop()
+                aaha_scraper.sessions.release()
+            if not job_store.finish(country, city, state, data_status, error=error, count_attempt=False, owner=owner):
+                logger.warning(f"[{owner}] {city}, {state} was reclaimed by another node, its outcome is not recorded")
+            processed += 1
+    finally:
+        aaha_scraper.sessions.close()
+        aaha_scraper.search_cache.close()
+        aaha_scraper.hospital_index.close()
+        job_store.close()
+    logger.info(f"[{owner}] Done, {processed} cities processed.")
+    report_file(aaha_scraper.metrics.file_path)
+    return processed
+
+
+def seed(db_path, wal=True):
+    job_store = JobStore(db_path, wal=wal)
+    try:
+        for file_path in get_input_files():
+            with pd.ExcelFile(file_path, engine="openpyxl") as xls:
+                for country, df in pd.read_excel(xls, sheet_name=None).items():
+                    job_store.import_sheet(country, df.fillna(""))
+        logger.info(f"Job store {db_path} : {job_store.counts()}")
+    finally:
+        job_store.close()
+
+
+def status(db_path, wal=True):
+    job_store = JobStore(db_path, wal=wal)
+    try:
+        logger.info(f"Job store {db_path} : {job_store.counts()}")
+        for owner, country, city, state, lease_expires, heartbeat_at in job_store.leases():
+            logger.info(f"  {owner} : {city}, {state} ({country}) - last heartbeat {heartbeat_at}, lease until {lease_expires}")
+    finally:
+        job_store.close()
+
+
+def export(db_path, wal=True):
+    aaha_scraper = AahaScraper()
+    aaha_scraper.job_store = JobStore(db_path, wal=wal)
+    try:
+        file_path = get_input_files()[0]
+        with pd.ExcelFile(file_path, engine="openpyxl") as xls:
+            sheets_dict = pd.read_excel(xls, sheet_name=None)
+        aaha_scraper.export_input_sheets({k: [df.fillna(""), file_path] for k, df in sheets_dict.items()})
+    finally:
+        aaha_scraper.job_store.close()
+        aaha_scraper.search_cache.close()
+        aaha_scraper.hospital_index.close()
+
+
+def refresh(db_path, wal=True, country=None, older_than_days=None):
+    aaha_scraper = AahaScraper()
+    aaha_scraper.job_store = JobStore(db_path, wal=wal)
+    try:
+        older_than = older_than_days * 24 * 3600 if older_than_days else None
+        aaha_scraper.queue_refresh(country=country, older_than=older_than)
+        logger.info(f"Job store {db_path} : {aaha_scraper.job_store.counts()}")
+    finally:
+        aaha_scraper.job_store.close()
+        aaha_scraper.search_cache.close()
+        aaha_scraper.hospital_index.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape cities from a shared, lease-based job store.")
+    parser.add_argument("command", choices=("seed", "work", "status", "export", "refresh"))
+    parser.add_argument("--db", default=STATE_DB_PATH, help="job store shared by all nodes")
+    parser.add_argument("--no-wal", action="store_true", help="rollback journal instead of WAL (network shares)")
+    parser.add_argument("--owner", default=f"{platform.node()}:{os.getpid()}")
+    parser.add_argument("--processes", type=int, default=1, help="workers (browsers) on this node")
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--lease", type=int, default=900, help="lease length in seconds")
+    parser.add_argument("--max-attempts", type=int, default=3)
+    parser.add_argument("--wait", action="store_true", help="keep polling for new cities instead of exiting")
+    parser.add_argument("--no-search-cache", action="store_true", help="search every city again (refresh runs)")
+    parser.add_argument("--recycle-on-refresh", action="store_true",
+                        help="start a fresh browser on every search refresh, not only after a block")
+    parser.add_argument("--country", help="refresh : only this country's cities")
+    parser.add_argument("--older-than", type=float, help="refresh : only cities finished more than this many days ago")
+    args = parser.parse_args()
+    wal = not args.no_wal
+
+    if args.command == "seed":
+        seed(args.db, wal=wal)
+    elif args.command == "status":
+        status(args.db, wal=wal)
+    elif args.command == "export":
+        export(args.db, wal=wal)
+    elif args.command == "refresh":
+        refresh(args.db, wal=wal, country=args.country, older_than_days=args.older_than)
+    elif args.processes == 1:
+        work(args.db, args.owner, args.headless, args.lease, args.max_attempts, args.wait, wal,
+             search_cache=not args.no_search_cache, recycle_on_refresh=args.recycle_on_refresh)
+    else:
+        file_lock = mp.Lock()
+        pacing_state = shared_state(**PACING)
+        pool = [
+            mp.Process(target=work, args=(args.db, f"{args.owner}/{i}", args.headless, args.lease, args.max_attempts,
+                                          args.wait, wal, file_lock, not args.no_search_cache, pacing_state,
+                                          args.recycle_on_refresh))
+            for i in range(1, args.processes + 1)
+        ]
+        for process in pool:
+            process.start()
+        for process in pool:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
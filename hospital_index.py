@@ -0,0 +1,144 @@
+import os
+import json
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+
+
+logger = logging.getLogger(__name__)
+
+# Fields filled in by process_hospital_page; everything else comes from `var locations`
+DETAIL_FIELDS = (
+    "Website", "Phone", "Email", "Social Media",
+    "Veterinarians", "Species Treated", "Hospital Hours", "Mission"
+)
+
+
+def hospital_key(location):
+    """
+    Stable identity for one entry of the `var locations` payload:
+    the AAHA record number when present, otherwise name + rounded lat/lng.
+    """
+    for field in ("recno", "recNo", "RecNo", "id"):
+        if location.get(field):
+            return f"recno:{location[field]}"
+    name = str(location.get("name", "")).strip().lower()
+    try:
+        lat, lng = round(float(location.get("lat")), 5), round(float(location.get("lng")), 5)
+    except (TypeError, ValueError):
+        lat, lng = location.get("lat"), location.get("lng")
+    return f"{name}|{lat}|{lng}"
+
+
+class HospitalIndex:
+    """
+    Persistent cross-city index of hospital detail records, so neighbouring
+    searches that return the same hospital only visit its detail page once.
+    One SQLite row per hospital (WAL mode): a save writes only that key, so
+    threads, pool workers and fleet processes share the store without
+    overwriting each other's newer records. The JSON index of older runs
+    (same path with a .json extension) is imported once.
+    """
+    def __init__(self, db_path, lock=None):
+        self.db_path = db_path
+        self.lock = lock or threading.Lock()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=30000")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS hospitals (
+                hospital_key TEXT PRIMARY KEY,
+                record       TEXT NOT NULL,
+                seen_at      TEXT
+            )
+        """)
+        self._import_json(os.path.splitext(db_path)[0] + ".json")
+
+
+    def _import_json(self, json_path):
+        """Imports the index of runs that stored it as one JSON file, when the table is still empty."""
+        if not os.path.exists(json_path):
+            return
+        with self.lock:
+            if self.conn.execute("SELECT 1 FROM hospitals LIMIT 1").fetchone():
+                return
+            try:
+                with open(json_path, 'r', encoding='utf-8') as file:
+                    records = json.load(file)
+            except (json.JSONDecodeError, IOError) as e:
+                logger.warning(f"Could not read hospital index {json_path}: {e}")
+                return
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO hospitals (hospital_key, record, seen_at) VALUES (?, ?, ?)",
+                    [(key, json.dumps(record), record.get("seen_at")) for key, record in records.items()],
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        logger.info(f"Imported {len(records)} hospitals from {json_path}")
+
+
+    def get(self, key):
+        """Returns the cached detail record for `key`, or None if never scraped."""
+        if not key:
+            return None
+        with self.lock:
+            row = self.conn.execute("SELECT record FROM hospitals WHERE hospital_key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+
+    def add(self, key, entry, location_fp=None, detail_fp=None):
+        """
+        Stores the detail fields of an extracted hospital entry under `key`,
+        with the fingerprints incremental runs compare against (see incremental.py).
+        """
+        if not key:
+            return
+        record = {field: entry[field] for field in DETAIL_FIELDS if field in entry}
+        record["Name"] = entry.get("Name", "N/A")
+        record["seen_at"] = datetime.now().isoformat(timespec="seconds")
+        if location_fp:
+            record["location_fp"] = location_fp
+        if detail_fp:
+            record["detail_fp"] = detail_fp
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO hospitals (hospital_key, record, seen_at) VALUES (?, ?, ?)",
+                (key, json.dumps(record), record["seen_at"]),
+            )
+
+
+    def is_fresh(self, record, location_fp=None, max_age=None):
+        """
+        False when the results page changed since, or the record is older than
+        `max_age` seconds. Records indexed before fingerprints existed only age out.
+        """
+        if location_fp and record.get("location_fp") not in (None, location_fp):
+            return False
+        if max_age and record.get("seen_at"):
+            age = datetime.now() - datetime.fromisoformat(record["seen_at"])
+            if age.total_seconds() > max_age:
+                return False
+        return True
+
+
+    def apply(self, key, entry, location_fp=None, max_age=None):
+        """Copies cached detail fields into `entry`. Returns True on a (fresh) hit."""
+        record = self.get(key)
+        if not record or not self.is_fresh(record, location_fp=location_fp, max_age=max_age):
+            return False
+        for field in DETAIL_FIELDS:
+            if field in record:
+                entry[field] = record[field]
+        return True
+
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
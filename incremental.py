@@ -0,0 +1,100 @@
+"""
+Change detection for refresh runs.
+
+- location_fingerprint : what the results page says about a hospital (name,
+  address, phone, position, practice type). A different fingerprint under the
+  same hospital key means its detail page has to be visited again.
+- detail_fingerprint   : content hash of an extracted detail record, so a
+  revisit can tell whether anything actually changed.
+- diff_locations       : added / removed / moved / renamed hospitals between
+  two `var locations` payloads of the same city.
+"""
+import os
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime
+
+from hospital_index import DETAIL_FIELDS, hospital_key
+
+
+logger = logging.getLogger(__name__)
+
+LOCATION_FIELDS = ("name", "address", "phone", "lat", "lng", "icon")
+# Moves smaller than this (degrees, ~10 m) are geocoding noise
+MOVE_TOLERANCE = 0.0001
+
+
+def _digest(data):
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+def location_fingerprint(location):
+    values = {field: location.get(field) for field in LOCATION_FIELDS}
+    for field in ("lat", "lng"):
+        try:
+            values[field] = round(float(values[field]), 4)
+        except (TypeError, ValueError):
+            pass
+    if isinstance(values["name"], str):
+        values["name"] = values["name"].strip()
+    return _digest(values)
+
+
+def detail_fingerprint(entry):
+    return _digest({field: entry.get(field) for field in DETAIL_FIELDS})
+
+
+def _hospitals(locations):
+    return {
+        hospital_key(location): location
+        for location in locations or []
+        if "Your Location" not in location.get("name", "")
+    }
+
+
+def _moved(old, new):
+    try:
+        return (abs(float(old["lat"]) - float(new["lat"])) > MOVE_TOLERANCE
+                or abs(float(old["lng"]) - float(new["lng"])) > MOVE_TOLERANCE)
+    except (KeyError, TypeError, ValueError):
+        return False
+
+
+def diff_locations(old_locations, new_locations):
+    """{"added", "removed", "moved", "renamed", "changed", "unchanged"} hospital names."""
+    old, new = _hospitals(old_locations), _hospitals(new_locations)
+    diff = {"added": [], "removed": [], "moved": [], "renamed": [], "changed": [], "unchanged": []}
+    for key, location in new.items():
+        name = location.get("name", "N/A").strip()
+        if key not in old:
+            diff["added"].append(name)
+        elif location_fingerprint(location) == location_fingerprint(old[key]):
+            diff["unchanged"].append(name)
+        elif old[key].get("name", "").strip() != name:
+            diff["renamed"].append(name)
+        elif _moved(old[key], location):
+            diff["moved"].append(name)
+        else:
+            diff["changed"].append(name)
+    diff["removed"] = [location.get("name", "N/A").strip() for key, location in old.items() if key not in new]
+    return diff
+
+
+class ChangeLog:
+    """Appends one JSONL line per city diff (and per revisited hospital whose details changed)."""
+    def __init__(self, file_path, lock=None):
+        self.file_path = file_path
+        self.lock = lock or threading.Lock()
+
+
+    def write(self, kind, country, city, state, **fields):
+        record = {
+            "kind": kind, "country": country, "city": city, "state": state,
+            "at": datetime.now().isoformat(timespec="seconds"), **fields,
+        }
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        with self.lock:
+            with open(self.file_path, 'a', encoding='utf-8') as file:
+                file.write(json.dumps(record) + "\n")
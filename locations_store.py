@@ -0,0 +1,174 @@
+import os
+import gzip
+import json
+import logging
+import threading
+from datetime import datetime
+
+
+logger = logging.getLogger(__name__)
+
+
+class LocationsStore:
+    """
+    Append-only store for the `var locations` payload of every searched city.
+    - <date>/shard_<pid>.jsonl[.gz] : one record per line
+      {"key": "{city}_{state}", "country", "city", "state", "miles", "saved_at", "locations"}
+    - <date>/shard_<pid>.idx        : one line per record {"key", "offset", "length", "saved_at"}
+    Every process appends to its own shard, so a write is O(record) and never
+    rewrites older data; a crash can at worst cut off the last line. Compressed
+    shards write each record as its own gzip member, which keeps the offsets
+    seekable (concatenated members are still one valid gzip stream).
+    The newest-record index is kept in memory and only the index lines
+    appended since the previous lookup (by any process) are read.
+    """
+    def __init__(self, root, compress=False, lock=None):
+        self.root = root
+        self.compress = compress
+        self.lock = lock or threading.Lock()
+        self.index_lock = threading.Lock()
+        self.latest = {}
+        self.index_offsets = {}
+
+
+    def shard_path(self, date_stamp=None):
+        date_stamp = date_stamp or datetime.now().strftime('%Y%m%d')
+        extension = "jsonl.gz" if self.compress else "jsonl"
+        return os.path.join(self.root, date_stamp, f"shard_{os.getpid()}.{extension}")
+
+
+    def append(self, country, city, state, locations, miles=None):
+        """Appends one city's locations and indexes it. Returns the shard path."""
+        if isinstance(locations, str):
+            try:
+                locations = json.loads(locations)
+            except json.JSONDecodeError:
+                pass
+        key = f'{city}_{state}'
+        record = {
+            "key": key,
+            "country": country,
+            "city": city,
+            "state": state,
+            "miles": miles,
+            "saved_at": datetime.now().isoformat(timespec="seconds"),
+            "locations": locations,
+        }
+        data = (json.dumps(record) + "\n").encode('utf-8')
+        if self.compress:
+            data = gzip.compress(data)
+
+        path = self.shard_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self.lock:
+            with open(path, 'ab') as file:
+                offset = file.tell()
+                file.write(data)
+            entry = {"key": key, "offset": offset, "length": len(data), "saved_at": record["saved_at"]}
+            with open(self.index_path(path), 'a', encoding='utf-8') as file:
+                file.write(json.dumps(entry) + "\n")
+        return path
+
+
+    @staticmethod
+    def index_path(shard_path):
+        return shard_path.split(".jsonl")[0] + ".idx"
+
+
+    def dates(self):
+        """Date folders in the store, oldest first."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, name)))
+
+
+    def shards(self, date_stamp=None):
+        dates = [date_stamp] if date_stamp else self.dates()
+        paths = []
+        for date in dates:
+            folder = os.path.join(self.root, date)
+            if os.path.isdir(folder):
+                paths.extend(os.path.join(folder, name) for name in sorted(os.listdir(folder)) if ".jsonl" in name)
+        return paths
+
+
+    def refresh_index(self):
+        """Reads the index lines appended since the last call into `latest`."""
+        for path in self.shards():
+            index_path = self.index_path(path)
+            start = self.index_offsets.get(index_path, 0)
+            if not os.path.exists(index_path) or os.path.getsize(index_path) <= start:
+                continue
+            with open(index_path, 'rb') as file:
+                file.seek(start)
+                data = file.read()
+            # Whole lines only, a line still being written is read next time
+            complete = data.rfind(b"\n") + 1
+            self.index_offsets[index_path] = start + complete
+            for line in data[:complete].splitlines():
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn line after a crash
+                    continue
+                current = self.latest.get(entry["key"])
+                if current is None or entry["saved_at"] >= current[0]:
+                    self.latest[entry["key"]] = (entry["saved_at"], path, entry["offset"], entry["length"])
+
+
+    def index(self, date_stamp=None):
+        """{key: (shard path, offset, length)} of the newest record per city."""
+        if date_stamp is None:
+            with self.index_lock:
+                self.refresh_index()
+                return {key: (path, offset, length) for key, (_, path, offset, length) in self.latest.items()}
+        entries = []
+        for path in self.shards(date_stamp):
+            index_path = self.index_path(path)
+            if not os.path.exists(index_path):
+                continue
+            with open(index_path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn last line after a crash
+                        continue
+                    entries.append((entry["saved_at"], entry["key"], path, entry["offset"], entry["length"]))
+        return {key: (path, offset, length) for _, key, path, offset, length in sorted(entries)}
+
+
+    def read_at(self, path, offset, length):
+        with open(path, 'rb') as file:
+            file.seek(offset)
+            data = file.read(length)
+        if path.endswith(".gz"):
+            data = gzip.decompress(data)
+        return json.loads(data)
+
+
+    def get(self, city, state, date_stamp=None):
+        """Seeks straight to the newest record of one city, or None."""
+        if date_stamp is None:
+            with self.index_lock:
+                self.refresh_index()
+                location = self.latest.get(f'{city}_{state}')
+            return self.read_at(*location[1:]) if location else None
+        location = self.index(date_stamp).get(f'{city}_{state}')
+        return self.read_at(*location) if location else None
+
+
+    def iter_records(self, date_stamp=None):
+        """Streams every record, shard by shard, without loading whole files."""
+        for path in self.shards(date_stamp):
+            opener = gzip.open if path.endswith(".gz") else open
+            try:
+                with opener(path, 'rt', encoding='utf-8') as file:
+                    for line in file:
+                        try:
+                            yield json.loads(line)
+                        except json.JSONDecodeError:
+                            logger.warning(f"Skipping unreadable record in {path}")
+            except (EOFError, gzip.BadGzipFile) as e:
+                # Truncated gzip member at the end of a shard
+                logger.warning(f"Stopped reading {path} early: {e}")
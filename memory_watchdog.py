@@ -0,0 +1,98 @@
+import os
+import gc
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+
+import psutil
+
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+class MemoryWatchdog:
+    """
+    Keeps a long run inside a memory budget. Samples the RSS of this Python
+    process and of the driver's process tree (chromedriver + every Chrome
+    process under it) and tells the caller when the browser should be
+    recycled. It has no thread of its own: the scraper calls `check` at its
+    safe points (between hospitals and between cities), where swapping the
+    driver cannot lose page state.
+    Samples are appended to `log_path` (JSONL) at most every `log_every` seconds.
+    """
+    def __init__(self, browser_limit_mb=1500, python_limit_mb=1000, log_path=None, log_every=60, lock=None):
+        self.browser_limit_mb = browser_limit_mb
+        self.python_limit_mb = python_limit_mb
+        self.log_path = log_path
+        self.log_every = log_every
+        self.lock = lock or threading.Lock()
+        self.process = psutil.Process()
+        self.last_logged = 0.0
+        self.recycles = 0
+
+
+    @staticmethod
+    def browser_processes(driver):
+        """chromedriver and all its descendants, or [] without a live driver."""
+        try:
+            root = psutil.Process(driver.service.process.pid)
+            return [root] + root.children(recursive=True)
+        except (AttributeError, psutil.Error):
+            return []
+
+
+    def sample(self, driver=None):
+        """{"python_mb", "browser_mb", "browser_processes"} right now."""
+        browser_rss = 0
+        processes = self.browser_processes(driver) if driver is not None else []
+        for process in processes:
+            try:
+                browser_rss += process.memory_info().rss
+            except psutil.Error:
+                # Renderer exited between listing and sampling
+                continue
+        return {
+            "python_mb": round(self.process.memory_info().rss / MB, 1),
+            "browser_mb": round(browser_rss / MB, 1),
+            "browser_processes": len(processes),
+        }
+
+
+    def log(self, sample, event=None):
+        if not self.log_path:
+            return
+        record = {"at": datetime.now().isoformat(timespec="seconds"), "pid": os.getpid(), **sample}
+        if event:
+            record["event"] = event
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        with self.lock:
+            with open(self.log_path, 'a', encoding='utf-8') as file:
+                file.write(json.dumps(record) + "\n")
+
+
+    def check(self, driver):
+        """
+        Samples at a safe point. Returns why the browser should be recycled,
+        or None. Python over budget only triggers a collection and a warning,
+        a fresh browser would not give that memory back.
+        """
+        sample = self.sample(driver)
+        reason = None
+        if self.browser_limit_mb and sample["browser_mb"] > self.browser_limit_mb:
+            reason = f"browser using {sample['browser_mb']:.0f}MB > {self.browser_limit_mb}MB"
+            self.recycles += 1
+        if self.python_limit_mb and sample["python_mb"] > self.python_limit_mb:
+            gc.collect()
+            logger.warning(f"Python process using {sample['python_mb']:.0f}MB > {self.python_limit_mb}MB")
+
+        now = time.monotonic()
+        if reason or now - self.last_logged >= self.log_every:
+            self.last_logged = now
+            self.log(sample, event="recycle" if reason else None)
+            logger.info(f"Memory : python {sample['python_mb']:.0f}MB, "
+                        f"browser {sample['browser_mb']:.0f}MB in {sample['browser_processes']} processes")
+        return reason
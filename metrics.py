@@ -0,0 +1,222 @@
+"""
+Span timings for the scraper's phases, with deliberate sleeps kept apart.
+
+Every span is one JSONL line in output/metrics/<run>.jsonl:
+    {"span": "process_hospital_page", "country", "city", "state", "hospital",
+     "started_at", "duration", "sleep", "work", "ok", "result", "pid"}
+`sleep` is the time spent in AahaScraper.pause inside the span, `work` the rest.
+
+Usage : python metrics.py [metrics file | latest]   (end-of-run report)
+"""
+import os
+import json
+import time
+import logging
+import inspect
+import argparse
+import functools
+import threading
+from datetime import datetime
+from collections import defaultdict
+
+
+logger = logging.getLogger(__name__)
+
+
+class Metrics:
+    """
+    Records nested spans per thread. `add_sleep` charges a deliberate sleep to
+    every span that is open on the calling thread, so each level can report
+    its real work separately. Lines are appended under `lock`, so worker
+    processes of one run can share the file.
+    """
+    def __init__(self, file_path=None, lock=None):
+        self.file_path = file_path
+        self.lock = lock or threading.Lock()
+        self.local = threading.local()
+
+
+    def _stack(self):
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+
+    def add_sleep(self, seconds):
+        for frame in self._stack():
+            frame["sleep"] += seconds
+
+
+    def span(self, name, **labels):
+        return Span(self, name, labels)
+
+
+    def emit(self, record):
+        if not self.file_path:
+            return
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        with self.lock:
+            with open(self.file_path, 'a', encoding='utf-8') as file:
+                file.write(json.dumps(record) + "\n")
+
+
+class Span:
+    def __init__(self, metrics, name, labels):
+        self.metrics = metrics
+        self.name = name
+        self.labels = {key: value for key, value in labels.items() if value not in (None, "")}
+        self.result = None
+
+
+    def __enter__(self):
+        self.frame = {"sleep": 0.0}
+        self.metrics._stack().append(self.frame)
+        self.started_at = datetime.now().isoformat(timespec="milliseconds")
+        self.started = time.perf_counter()
+        return self
+
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.started
+        self.metrics._stack().pop()
+        sleep = min(self.frame["sleep"], duration)
+        record = {
+            "span": self.name,
+            **self.labels,
+            "started_at": self.started_at,
+            "duration": round(duration, 4),
+            "sleep": round(sleep, 4),
+            "work": round(duration - sleep, 4),
+            "ok": exc_type is None and self.result is not False,
+            "pid": os.getpid(),
+        }
+        if isinstance(self.result, str):
+            record["result"] = self.result
+        try:
+            self.metrics.emit(record)
+        except Exception as e:
+            logger.warning(f"Could not write metrics for {self.name}: {e}")
+        return False
+
+
+def timed(name):
+    """
+    Method decorator: runs the method inside a span labelled with the scraper's
+    current country/city/state (or the method's own `country`/`city`/`state`/
+    `hospital_name` arguments). Needs `self.metrics`.
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            arguments = signature.bind_partial(self, *args, **kwargs).arguments
+            labels = {
+                "country": arguments.get("country", self.country),
+                "city": arguments.get("city", self.city),
+                "state": arguments.get("state", self.state),
+                "hospital": arguments.get("hospital_name"),
+            }
+            with self.metrics.span(name, **labels) as span:
+                span.result = method(self, *args, **kwargs)
+                return span.result
+        return wrapper
+    return decorator
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def load_records(file_path):
+    records = []
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def build_report(records, slowest=10):
+    """Totals and percentiles per span, plus the slowest cities and hospitals."""
+    by_span = defaultdict(list)
+    for record in records:
+        by_span[record["span"]].append(record)
+
+    spans = {}
+    for name, items in by_span.items():
+        durations = [item["duration"] for item in items]
+        works = [item["work"] for item in items]
+        spans[name] = {
+            "count": len(items),
+            "failed": sum(1 for item in items if not item.get("ok", True)),
+            "total": round(sum(durations), 2),
+            "sleep": round(sum(item["sleep"] for item in items), 2),
+            "work": round(sum(works), 2),
+            "p50": round(percentile(durations, 50), 3),
+            "p90": round(percentile(durations, 90), 3),
+            "p99": round(percentile(durations, 99), 3),
+            "work_p50": round(percentile(works, 50), 3),
+            "work_p90": round(percentile(works, 90), 3),
+        }
+
+    def top(name):
+        items = sorted(by_span.get(name, []), key=lambda item: item["duration"], reverse=True)[:slowest]
+        return [
+            {key: item.get(key) for key in ("city", "state", "hospital", "duration", "sleep", "work", "result") if item.get(key) is not None}
+            for item in items
+        ]
+
+    return {"spans": spans, "slowest_cities": top("city"), "slowest_hospitals": top("process_hospital_page")}
+
+
+def log_report(report):
+    logger.info("=" * 20 + " Run metrics " + "=" * 20)
+    logger.info(f"{'span':<24}{'count':>7}{'total s':>10}{'sleep s':>10}{'work s':>10}{'p50':>8}{'p90':>8}{'p99':>8}")
+    for name, row in sorted(report["spans"].items(), key=lambda item: item[1]["total"], reverse=True):
+        logger.info(f"{name:<24}{row['count']:>7}{row['total']:>10.1f}{row['sleep']:>10.1f}{row['work']:>10.1f}"
+                    f"{row['p50']:>8.2f}{row['p90']:>8.2f}{row['p99']:>8.2f}")
+    for title, key in (("Slowest cities", "slowest_cities"), ("Slowest hospitals", "slowest_hospitals")):
+        if report[key]:
+            logger.info(f"{title}:")
+            for item in report[key]:
+                label = f"{item.get('city')}, {item.get('state')}"
+                if item.get("hospital"):
+                    label = f"{item['hospital']} ({label})"
+                logger.info(f"  {item['duration']:>8.1f}s (work {item['work']:.1f}s) {label}")
+
+
+def report_file(file_path, slowest=10):
+    """Builds, logs and saves (<file>.report.json) the report of one metrics file."""
+    if not file_path or not os.path.exists(file_path):
+        return None
+    report = build_report(load_records(file_path), slowest=slowest)
+    log_report(report)
+    with open(f"{os.path.splitext(file_path)[0]}.report.json", 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=4)
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="End-of-run report from a metrics file.")
+    parser.add_argument("file_path", nargs="?", default="latest")
+    parser.add_argument("--slowest", type=int, default=10)
+    args = parser.parse_args()
+
+    file_path = args.file_path
+    if file_path == "latest":
+        folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'output', 'metrics')
+        # memory_*.jsonl : watchdog samples that older runs wrote next to the metrics
+        files = sorted(
+            f for f in os.listdir(folder) if f.endswith(".jsonl") and not f.startswith("memory_")
+        ) if os.path.isdir(folder) else []
+        file_path = os.path.join(folder, files[-1]) if files else None
+    if report_file(file_path, slowest=args.slowest) is None:
+        logger.error(f"No metrics file found ({args.file_path})")
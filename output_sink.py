@@ -0,0 +1,210 @@
+"""
+Streaming output dataset, partitioned by country and state.
+
+    <root>/country=<country>/state=<state>/part-*.parquet|csv
+
+Cities are appended as they finish (one small Parquet part per city, or one
+appended CSV part per process and day) and `compact` later merges a partition
+into a single deduplicated file. The nested fields stay typed: lists of strings
+for Veterinarians / Species Treated and lists of {name, url} / {day, hours}
+records for Social Media / Hospital Hours (JSON text in the CSV fallback).
+
+Usage:
+    python output_sink.py compact [--country "United States"]
+    python output_sink.py export hospitals.xlsx [--country "United States"]
+"""
+import os
+import re
+import json
+import glob
+import logging
+import argparse
+import threading
+import pandas as pd
+from datetime import datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+
+logger = logging.getLogger(__name__)
+
+LIST_FIELDS = ("Veterinarians", "Species Treated")
+RECORD_FIELDS = {"Social Media": ("name", "url"), "Hospital Hours": ("day", "hours")}
+NESTED_FIELDS = LIST_FIELDS + tuple(RECORD_FIELDS)
+SCALAR_FIELDS = (
+    "Country", "State", "City", "Key", "Name", "Address", "Phone", "Latitude", "Longitude",
+    "Distance", "Practice", "Website", "Email", "Mission", "Scraped At",
+)
+
+
+def parquet_schema():
+    fields = [pa.field(name, pa.string()) for name in SCALAR_FIELDS]
+    fields += [pa.field(name, pa.list_(pa.string())) for name in LIST_FIELDS]
+    fields += [
+        pa.field(name, pa.list_(pa.struct([(sub, pa.string()) for sub in subfields])))
+        for name, subfields in RECORD_FIELDS.items()
+    ]
+    return pa.schema(fields)
+
+
+def safe_name(value):
+    return re.sub(r'[\\/:*?"<>|=]+', "_", str(value)).strip() or "_"
+
+
+def normalize(entry, country, city, state, key, scraped_at):
+    """One extracted_data entry as a flat row with typed nested columns."""
+    row = {name: "" if entry.get(name) is None else str(entry.get(name)) for name in SCALAR_FIELDS}
+    row.update({"Country": country, "State": state, "City": city.title(), "Key": key or "", "Scraped At": scraped_at})
+    for name in LIST_FIELDS:
+        values = entry.get(name) or []
+        row[name] = [str(value) for value in (values if isinstance(values, list) else [values])]
+    for name, (first, second) in RECORD_FIELDS.items():
+        values = entry.get(name) or {}
+        # Hours/Social Media are dicts; empty defaults come in as []
+        items = values.items() if isinstance(values, dict) else []
+        row[name] = [{first: str(k), second: str(v)} for k, v in items]
+    return row
+
+
+class OutputSink:
+    """
+    Appends finished cities to the partitioned dataset. `fmt` is "parquet",
+    "csv" or "auto" (Parquet when pyarrow is installed, CSV otherwise).
+    """
+    def __init__(self, root, fmt="auto", lock=None):
+        if fmt == "auto":
+            fmt = "parquet" if pa is not None else "csv"
+        if fmt == "parquet" and pa is None:
+            raise ImportError("pyarrow is required for the parquet output format, install it or use fmt='csv'")
+        if fmt not in ("parquet", "csv"):
+            raise ValueError(f"Unknown output format '{fmt}', expected 'parquet', 'csv' or 'auto'")
+        self.root = root
+        self.fmt = fmt
+        self.lock = lock or threading.Lock()
+
+
+    def partition_path(self, country, state):
+        return os.path.join(self.root, f"country={safe_name(country)}", f"state={safe_name(state)}")
+
+
+    def write(self, extracted_data, country, city, state, keys=None):
+        """Appends one city's hospitals to its partition. Returns the part file."""
+        keys = keys or {}
+        scraped_at = datetime.now().isoformat(timespec="seconds")
+        rows = [
+            normalize(entry, country, city, state, keys.get(str(entry.get("Name", "")).strip()), scraped_at)
+            for entry in extracted_data
+        ]
+        folder = self.partition_path(country, state)
+        os.makedirs(folder, exist_ok=True)
+        if self.fmt == "parquet":
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            file_path = os.path.join(folder, f"part-{stamp}-{os.getpid()}.parquet")
+            tmp_path = f"{file_path}.tmp"
+            pq.write_table(pa.Table.from_pylist(rows, schema=parquet_schema()), tmp_path)
+            os.replace(tmp_path, file_path)
+            return file_path
+
+        file_path = os.path.join(folder, f"part-{datetime.now().strftime('%Y%m%d')}-{os.getpid()}.csv")
+        df = pd.DataFrame(rows, columns=SCALAR_FIELDS + NESTED_FIELDS)
+        for name in NESTED_FIELDS:
+            df[name] = df[name].apply(json.dumps)
+        with self.lock:
+            df.to_csv(file_path, mode="a", index=False, header=not os.path.exists(file_path))
+        return file_path
+
+
+    def partitions(self, country=None):
+        pattern = os.path.join(self.root, f"country={safe_name(country)}" if country else "country=*", "state=*")
+        return sorted(path for path in glob.glob(pattern) if os.path.isdir(path))
+
+
+    @staticmethod
+    def read_part(file_path):
+        if file_path.endswith(".parquet"):
+            return pq.read_table(file_path).to_pandas()
+        df = pd.read_csv(file_path, dtype=str, keep_default_na=False)
+        for name in NESTED_FIELDS:
+            df[name] = df[name].apply(json.loads)
+        return df
+
+
+    def read(self, country=None):
+        """The whole dataset (or one country) as a DataFrame."""
+        parts = [
+            self.read_part(path)
+            for folder in self.partitions(country)
+            for path in sorted(glob.glob(os.path.join(folder, "*.parquet")) + glob.glob(os.path.join(folder, "*.csv")))
+        ]
+        if not parts:
+            return pd.DataFrame(columns=SCALAR_FIELDS + NESTED_FIELDS)
+        return pd.concat(parts, ignore_index=True)
+
+
+    @staticmethod
+    def dedupe(df):
+        """Keeps the newest row per hospital (Key, or Name + Address when there is none)."""
+        identity = df["Key"].where(df["Key"] != "", df["Name"] + "|" + df["Address"])
+        df = df.assign(_identity=identity).sort_values("Scraped At", kind="stable")
+        return df.drop_duplicates("_identity", keep="last").drop(columns="_identity").reset_index(drop=True)
+
+
+    def compact(self, country=None):
+        """
+        Merges every partition's parts into one deduplicated file. Run it when
+        no scraper is writing, parts added meanwhile would be deleted unmerged.
+        """
+        for folder in self.partitions(country):
+            parts = sorted(glob.glob(os.path.join(folder, "*.parquet")) + glob.glob(os.path.join(folder, "*.csv")))
+            if not parts or (len(parts) == 1 and os.path.basename(parts[0]).startswith("compacted-")):
+                continue
+            df = self.dedupe(pd.concat([self.read_part(path) for path in parts], ignore_index=True))
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            if self.fmt == "parquet":
+                file_path = os.path.join(folder, f"compacted-{stamp}.parquet")
+                table = pa.Table.from_pandas(df, schema=parquet_schema(), preserve_index=False)
+                pq.write_table(table, f"{file_path}.tmp")
+            else:
+                file_path = os.path.join(folder, f"compacted-{stamp}.csv")
+                encoded = df.copy()
+                for name in NESTED_FIELDS:
+                    encoded[name] = encoded[name].apply(lambda value: json.dumps(list(value)))
+                encoded.to_csv(f"{file_path}.tmp", index=False)
+            os.replace(f"{file_path}.tmp", file_path)
+            for path in parts:
+                if path != file_path:
+                    os.remove(path)
+            logger.info(f"Compacted {len(parts)} parts into {file_path} ({len(df)} hospitals)")
+
+
+    def export_xlsx(self, file_path, country=None):
+        """Readable Excel view of the deduplicated dataset, the same flattening as the old per-city files."""
+        df = self.dedupe(self.read(country))
+        for name in LIST_FIELDS:
+            df[name] = df[name].apply(lambda values: "; ".join(values))
+        for name, (first, second) in RECORD_FIELDS.items():
+            df[name] = df[name].apply(lambda items, a=first, b=second: str({item[a]: item[b] for item in items}))
+        df.to_excel(file_path, index=False)
+        logger.info(f"Exported {len(df)} hospitals to {file_path}")
+        return file_path
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    from scraper import DATASET_FOLDER, OUTPUT_FORMAT
+
+    parser = argparse.ArgumentParser(description="Compact or export the partitioned hospitals dataset.")
+    parser.add_argument("command", choices=("compact", "export"))
+    parser.add_argument("file_path", nargs="?", help="xlsx file to write (export)")
+    parser.add_argument("--country", default=None)
+    args = parser.parse_args()
+
+    sink = OutputSink(DATASET_FOLDER, fmt=OUTPUT_FORMAT)
+    if args.command == "compact":
+        sink.compact(country=args.country)
+    else:
+        sink.export_xlsx(args.file_path or os.path.join(os.path.dirname(DATASET_FOLDER), "hospitals.xlsx"), country=args.country)
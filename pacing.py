@@ -0,0 +1,119 @@
+import time
+import logging
+import threading
+import multiprocessing as mp
+
+
+logger = logging.getLogger(__name__)
+
+# Slots of the bucket state : rate, tokens, updated_at, blocked_until
+RATE, TOKENS, UPDATED_AT, BLOCKED_UNTIL = range(4)
+
+
+def shared_state(rate=0.2, burst=1, **_):
+    """
+    Bucket state in shared memory, for RateControllers in several threads or
+    processes that pace one budget. Pass it to each as `state` (as a Process
+    argument, it cannot go through a queue). Takes the PACING settings as-is.
+    """
+    return mp.Array('d', [rate, burst, time.monotonic(), 0.0])
+
+
+class RateController:
+    """
+    Central pacing for every navigation against the site.
+
+    A token bucket refilled at `rate` navigations/second, where the rate follows
+    AIMD (additive increase, multiplicative decrease) from what the site sends back:
+    - on_success : rate += increase                  (site is happy, speed up slowly)
+    - on_slow    : rate *= slow_decrease             (timeouts, empty results)
+    - on_block   : rate *= block_decrease + cooldown (verification pages)
+    Every event is also passed to the `listeners` as listener(event, reason).
+    Safe to share between threads. With a `state` from shared_state(), every
+    controller built on it (one per worker thread or process, each with its own
+    listeners) draws from the same bucket and sees the others' backoffs.
+    """
+    def __init__(self, rate=0.2, min_rate=0.01, max_rate=1.0, increase=0.02,
+                 slow_decrease=0.75, block_decrease=0.5, cooldown=60, burst=1, state=None):
+        if state is None:
+            self.state = [rate, burst, time.monotonic(), 0.0]
+            self.lock = threading.Lock()
+        else:
+            self.state = state
+            # The Array's own lock is a multiprocessing RLock, good across threads too
+            self.lock = state.get_lock()
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.slow_decrease = slow_decrease
+        self.block_decrease = block_decrease
+        self.cooldown = cooldown
+        self.burst = burst
+        self.listeners = []
+
+
+    rate = property(lambda self: self.state[RATE], lambda self, value: self.state.__setitem__(RATE, value))
+    tokens = property(lambda self: self.state[TOKENS], lambda self, value: self.state.__setitem__(TOKENS, value))
+    updated_at = property(lambda self: self.state[UPDATED_AT],
+                          lambda self, value: self.state.__setitem__(UPDATED_AT, value))
+    blocked_until = property(lambda self: self.state[BLOCKED_UNTIL],
+                             lambda self, value: self.state.__setitem__(BLOCKED_UNTIL, value))
+
+
+    def _notify(self, event, reason):
+        for listener in self.listeners:
+            try:
+                listener(event, reason)
+            except Exception as e:
+                logger.warning(f"Pacing listener failed on {event}: {e}")
+
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+
+    def acquire(self):
+        """Blocks until the next navigation is allowed. Returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    delay = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                else:
+                    delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+    def _set_rate(self, rate, reason):
+        old_rate = self.rate
+        self.rate = max(self.min_rate, min(self.max_rate, rate))
+        if reason:
+            logger.info(f"Pacing {reason}: {old_rate * 60:.1f} -> {self.rate * 60:.1f} navigations/min")
+
+
+    def on_success(self):
+        with self.lock:
+            self._set_rate(self.rate + self.increase, reason=None)
+        self._notify("success", None)
+
+
+    def on_slow(self, reason="slow response"):
+        with self.lock:
+            self._set_rate(self.rate * self.slow_decrease, reason=reason)
+        self._notify("slow", reason)
+
+
+    def on_block(self, reason="verification page"):
+        with self.lock:
+            self._set_rate(self.rate * self.block_decrease, reason=reason)
+            self.tokens = 0
+            self.blocked_until = time.monotonic() + self.cooldown
+            logger.warning(f"Backing off for {self.cooldown}s after {reason}")
+        self._notify("block", reason)
@@ -0,0 +1,76 @@
+import os
+import gzip
+import json
+import hashlib
+import threading
+from datetime import datetime
+
+
+class PageArchive:
+    """
+    Content-addressed archive of raw pages for offline re-parsing.
+    - objects/<sha[:2]>/<sha>.html.gz : gzip'd HTML, stored once per unique page
+    - runs/<run_id>.jsonl             : one line per captured page, in capture order
+      {"kind": "results"|"detail", "country", "city", "state", "hospital", "sha", "captured_at"}
+    """
+    def __init__(self, root, run_id=None, lock=None):
+        self.root = root
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.lock = lock or threading.Lock()
+        self.objects_folder = os.path.join(root, 'objects')
+        self.runs_folder = os.path.join(root, 'runs')
+
+
+    def object_path(self, sha):
+        return os.path.join(self.objects_folder, sha[:2], f"{sha}.html.gz")
+
+
+    def put(self, html):
+        """Stores `html` (if not already there) and returns its sha256."""
+        data = html.encode('utf-8')
+        sha = hashlib.sha256(data).hexdigest()
+        path = self.object_path(sha)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, 'wb') as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        return sha
+
+
+    def get(self, sha):
+        with gzip.open(self.object_path(sha), 'rb') as file:
+            return file.read().decode('utf-8')
+
+
+    def record(self, kind, html, country, city, state, hospital=None):
+        """Archives one page and appends it to this run's manifest."""
+        entry = {
+            "kind": kind,
+            "country": country,
+            "city": city,
+            "state": state,
+            "hospital": hospital,
+            "sha": self.put(html),
+            "captured_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        os.makedirs(self.runs_folder, exist_ok=True)
+        with self.lock:
+            with open(os.path.join(self.runs_folder, f"{self.run_id}.jsonl"), 'a', encoding='utf-8') as file:
+                file.write(json.dumps(entry) + "\n")
+        return entry["sha"]
+
+
+    def runs(self):
+        """Run ids in the archive, oldest first."""
+        if not os.path.isdir(self.runs_folder):
+            return []
+        return sorted(f[:-len(".jsonl")] for f in os.listdir(self.runs_folder) if f.endswith(".jsonl"))
+
+
+    def iter_run(self, run_id):
+        with open(os.path.join(self.runs_folder, f"{run_id}.jsonl"), 'r', encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
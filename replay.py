@@ -0,0 +1,116 @@
+"""
+Re-runs the results/details extraction over a captured run from the page
+archive (see CAPTURE_PAGES in scraper.py), without a browser.
+
+Usage : python replay.py [run_id | latest] [--html-parser]
+Output: output/replay/<run_id>.json  ->  {"<city>_<state>": [records, ...]}
+"""
+import os
+import json
+import logging
+import argparse
+
+from page_archive import PageArchive
+from scraper import AahaScraper, ARCHIVE_FOLDER, OUTPUT_FOLDER
+from extractors import parse_locations_json, parse_result_anchors, parse_hospital_details
+
+
+logger = logging.getLogger(__name__)
+REPLAY_FOLDER = os.path.join(OUTPUT_FOLDER, 'replay')
+
+
+def group_run(archive, run_id):
+    """
+    Groups a run's manifest per city. A later results page for the same city
+    (a retry) starts that city over, like it did during the live run. Cities
+    whose results came from a checkpoint or the search cache have details pages
+    only, and get "results": None.
+    """
+    cities = {}
+    for entry in archive.iter_run(run_id):
+        key = (entry["country"], entry["city"], entry["state"])
+        if entry["kind"] == "results":
+            cities[key] = {"results": entry["sha"], "details": {}}
+        else:
+            cities.setdefault(key, {"results": None, "details": {}})["details"][entry["hospital"]] = entry["sha"]
+    return cities
+
+
+def load_results(aaha_scraper, archive, pages, fast=True):
+    """
+    Fills the scraper's result list from the archived results page or, without
+    one, from the city's stored locations. Returns False when neither is there.
+    """
+    city, state = aaha_scraper.city, aaha_scraper.state
+    if pages["results"] is None:
+        stored = aaha_scraper.locations_store.get(city, state)
+        if not stored or not isinstance(stored.get("locations"), list):
+            logger.warning(f"Skipping {city}, {state} : no results page captured and no stored locations "
+                           f"for its {len(pages['details'])} details pages")
+            return False
+        logger.info(f"No results page captured for {city}, {state}, using the locations stored {stored['saved_at']}")
+        aaha_scraper.add_search_results(locations=stored["locations"], hospital_list=[])
+        return True
+
+    results_page = archive.get(pages["results"])
+    json_data = parse_locations_json(results_page)
+    if not json_data:
+        logger.error(f"No location data in archived results page for {city}, {state}")
+        return False
+    aaha_scraper.add_search_results(
+        locations=json.loads(json_data),
+        hospital_list=parse_result_anchors(results_page, fast=fast),
+    )
+    return True
+
+
+def replay_run(run_id, fast=True, archive=None):
+    """Returns {"<city>_<state>": records} re-extracted from the archived pages."""
+    archive = archive or PageArchive(ARCHIVE_FOLDER)
+    aaha_scraper = AahaScraper()
+    aaha_scraper.use_hospital_index = False
+    output = {}
+    for (country, city, state), pages in group_run(archive, run_id).items():
+        aaha_scraper.reset_city()
+        aaha_scraper.country, aaha_scraper.city, aaha_scraper.state = country, city, state
+        if not load_results(aaha_scraper, archive, pages, fast=fast):
+            continue
+
+        for hospital_name, sha in pages["details"].items():
+            hospital_entry = aaha_scraper.find_hospital_entry(hospital_name)
+            if not hospital_entry:
+                logger.error(f"Hospital '{hospital_name}' not found in replayed results for {city}, {state}")
+                continue
+            try:
+                hospital_entry.update(parse_hospital_details(archive.get(sha), fast=fast))
+            except Exception as e:
+                logger.error(f"Error replaying details page for {hospital_name}: {e}")
+
+        output[f"{city}_{state}"] = aaha_scraper.standardize_data(extracted_data=aaha_scraper.extracted_data)
+        logger.info(f"Replayed {city}, {state} : {len(pages['details'])} details pages")
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-extract an archived scraper run offline.")
+    parser.add_argument("run_id", nargs="?", default="latest")
+    parser.add_argument("--html-parser", action="store_true", help="use the original html.parser path instead of lxml")
+    args = parser.parse_args()
+
+    archive = PageArchive(ARCHIVE_FOLDER)
+    runs = archive.runs()
+    if not runs:
+        logger.error(f"No captured runs in {ARCHIVE_FOLDER}")
+        return
+    run_id = runs[-1] if args.run_id == "latest" else args.run_id
+
+    output = replay_run(run_id, fast=not args.html_parser, archive=archive)
+    os.makedirs(REPLAY_FOLDER, exist_ok=True)
+    file_path = os.path.join(REPLAY_FOLDER, f"{run_id}.json")
+    with open(file_path, 'w', encoding='utf-8') as file:
+        json.dump(output, file, indent=4)
+    logger.info(f"Replayed {len(output)} cities from run {run_id} --> {file_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Resource-blocking profiles for Network.setBlockedURLs.
+
+Extraction only needs the HTML documents, the site's own scripts/XHR (the search
+form and `var locations`) and nothing visual, so images, fonts, media, map tiles
+and third-party trackers can be dropped to save bandwidth and browser memory.
+"""
+
+IMAGES = ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*", "*.bmp*", "*.avif*"]
+FONTS = ["*.woff*", "*.ttf*", "*.otf*", "*.eot*", "*fonts.googleapis.com*", "*fonts.gstatic.com*", "*use.typekit.net*"]
+MEDIA = ["*.mp4*", "*.webm*", "*.mp3*", "*.m4a*", "*.ogg*", "*youtube.com/embed*", "*player.vimeo.com*"]
+MAP_TILES = [
+    "*maps.googleapis.com/maps/vt*", "*maps.googleapis.com/maps/api/js/StaticMapService*",
+    "*maps.gstatic.com*", "*khms*.google.com*", "*tile.openstreetmap.org*", "*api.mapbox.com*",
+]
+TRACKERS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*connect.facebook.net*", "*facebook.com/tr*", "*hotjar.com*", "*clarity.ms*", "*hs-scripts.com*",
+    "*hs-analytics.net*", "*px.ads.linkedin.com*", "*snap.licdn.com*", "*bat.bing.com*", "*newrelic.com*",
+    "*nr-data.net*", "*cookielaw.org*", "*onetrust.com*",
+]
+
+BLOCK_PROFILES = {
+    "none": [],
+    "light": IMAGES + FONTS + MEDIA,
+    "aggressive": IMAGES + FONTS + MEDIA + MAP_TILES + TRACKERS,
+}
+
+
+def blocked_url_patterns(profile, allowlist=()):
+    """
+    URL patterns to block for `profile`. setBlockedURLs has no "allow" rules, so
+    the allowlist is a filter on the patterns themselves : every pattern whose text
+    contains an allowed entry is dropped (e.g. allowlist=("maps.googleapis.com",)
+    keeps all map requests). It is not matched against request hosts, so a generic
+    pattern such as "*.png*" still blocks images on an allowlisted site.
+    """
+    if profile not in BLOCK_PROFILES:
+        raise ValueError(f"Unknown resource blocking profile '{profile}', expected one of {list(BLOCK_PROFILES)}")
+    return [pattern for pattern in BLOCK_PROFILES[profile] if not any(allowed in pattern for allowed in allowlist)]
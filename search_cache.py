@@ -0,0 +1,86 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+
+class SearchCache:
+    """
+    Persistent cache of parsed search results (AahaScraper.search_snapshot),
+    keyed by country/city/state/radius. Entries older than `ttl` seconds are
+    misses; past `max_entries` the least recently used ones are evicted.
+    SQLite (WAL), so pool workers and later runs share it.
+    """
+    def __init__(self, db_path, ttl=7 * 24 * 3600, max_entries=5000):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA busy_timeout=30000")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS searches (
+                search_key TEXT PRIMARY KEY,
+                snapshot   TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                used_at    REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS searches_used_at ON searches (used_at)")
+
+
+    @staticmethod
+    def key(country, city, state, miles):
+        return "|".join(str(part).strip().lower() for part in (country, city, state, miles))
+
+
+    def get(self, country, city, state, miles):
+        """The cached snapshot if it is younger than the TTL, else None."""
+        search_key = self.key(country, city, state, miles)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT snapshot, created_at FROM searches WHERE search_key = ?", (search_key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self.ttl and time.time() - row[1] > self.ttl:
+                self.conn.execute("DELETE FROM searches WHERE search_key = ?", (search_key,))
+                return None
+            self.conn.execute("UPDATE searches SET used_at = ? WHERE search_key = ?", (time.time(), search_key))
+        return json.loads(row[0])
+
+
+    def put(self, country, city, state, miles, snapshot):
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO searches (search_key, snapshot, created_at, used_at) VALUES (?, ?, ?, ?)",
+                (self.key(country, city, state, miles), json.dumps(snapshot), now, now),
+            )
+            if self.max_entries:
+                self.conn.execute("""
+                    DELETE FROM searches WHERE search_key IN (
+                        SELECT search_key FROM searches ORDER BY used_at DESC LIMIT -1 OFFSET ?
+                    )
+                """, (self.max_entries,))
+
+
+    def invalidate(self, country, city, state):
+        """Drops a city's cached searches at every radius."""
+        prefix = self.key(country, city, state, "")
+        with self.lock:
+            self.conn.execute(
+                "DELETE FROM searches WHERE substr(search_key, 1, ?) = ?", (len(prefix), prefix)
+            )
+
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,96 @@
+import time
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+class SessionManager:
+    """
+    Keeps a scraper's WebDriver warm across cities instead of restarting Chrome
+    for every row. The driver is recycled when one of the policies trips:
+    - it has served `max_cities` cities,
+    - it is older than `max_age` seconds,
+    - it fails a health check (crashed tab, dead session, ...),
+    - its proxy got retired by the proxy pool,
+    - its process tree went over the memory watchdog's budget.
+    A search refresh replaces it too when it was caused by a block
+    (`recycle_on_block`), or always with `recycle_on_refresh`.
+    """
+    def __init__(self, scraper, max_cities=10, max_age=3600, recycle_on_refresh=False, recycle_on_block=True):
+        self.scraper = scraper
+        self.max_cities = max_cities
+        self.max_age = max_age
+        self.recycle_on_refresh = recycle_on_refresh
+        self.recycle_on_block = recycle_on_block
+        self.started_at = None
+        self.cities_served = 0
+
+
+    def is_healthy(self):
+        """Cheap round trip to make sure the browser still answers."""
+        driver = self.scraper.driver
+        if driver is None or not driver.session_id:
+            return False
+        try:
+            driver.execute_script("return document.readyState;")
+            return True
+        except Exception as e:
+            logger.warning(f"Driver health check failed: {e}")
+            return False
+
+
+    def recycle_reason(self):
+        """Returns why the current driver should be replaced, or None to keep it."""
+        if self.scraper.driver is None:
+            return "no driver"
+        if self.max_cities and self.cities_served >= self.max_cities:
+            return f"served {self.cities_served} cities"
+        if self.max_age and self.started_at and time.monotonic() - self.started_at >= self.max_age:
+            return f"older than {self.max_age}s"
+        if not self.is_healthy():
+            return "failed health check"
+        if self.scraper.proxy is not None and self.scraper.proxy.retired:
+            return f"proxy {self.scraper.proxy.name} retired"
+        if self.scraper.memory_watchdog is not None:
+            return self.scraper.memory_watchdog.check(self.scraper.driver)
+        return None
+
+
+    def start(self):
+        """Starts a fresh driver and resets the policy counters."""
+        self.scraper.close_driver()
+        try:
+            driver = self.scraper.get_driver()
+        except Exception as e:
+            logger.error(f"Failed to start driver: {e}")
+            return None
+        self.started_at = time.monotonic()
+        self.cities_served = 0
+        return driver
+
+
+    def acquire(self):
+        """Returns a live driver, recycling the current one only if a policy says so."""
+        reason = self.recycle_reason()
+        if reason is None:
+            return self.scraper.driver
+        logger.info(f"(Re)starting WebDriver session : {reason}")
+        return self.start()
+
+
+    def recycle(self):
+        """Unconditionally replaces the driver (used by refresh when configured to)."""
+        logger.info("Recycling WebDriver session...")
+        return self.start()
+
+
+    def release(self):
+        """Marks one city as done on the current driver."""
+        self.cities_served += 1
+
+
+    def close(self):
+        self.scraper.close_driver()
+        self.started_at = None
+        self.cities_served = 0
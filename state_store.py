@@ -0,0 +1,305 @@
+import os
+import json
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+
+
+logger = logging.getLogger(__name__)
+
+# `Data` values that mean a city needs no more work ("covered": inside a neighbour's planned search)
+DONE_STATUSES = ("added", "not found", "covered")
+# `IN (...)` placeholders for DONE_STATUSES; the values themselves are always bound
+DONE_PLACEHOLDERS = ", ".join("?" for _ in DONE_STATUSES)
+# Done cities re-queued for a refresh run (see JobStore.requeue); pending until searched again
+REFRESH_STATUS = "refresh"
+
+
+def now_str(offset=0):
+    return (datetime.now() + timedelta(seconds=offset)).isoformat(timespec="seconds")
+
+
+def utc_str(offset=0):
+    """Lease times : UTC, so nodes in other time zones (or across a DST change) compare them correctly."""
+    return (datetime.now(timezone.utc) + timedelta(seconds=offset)).isoformat(timespec="seconds")
+
+
+class JobStore:
+    """
+    Durable per-city job state in SQLite (WAL mode). Every status change is one
+    small transaction, so updates are O(1) and survive a crash mid-run. The input
+    workbook is only imported at start and exported now and then as a view.
+
+    Several nodes can share one store through leases (see fleet.py): `claim`
+    hands a city to one owner until its lease expires, `heartbeat` extends it.
+    WAL needs shared memory, so pass wal=False for a store on a network share.
+    """
+    def __init__(self, db_path, wal=True):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute(f"PRAGMA journal_mode={'WAL' if wal else 'DELETE'}")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=30000")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                country     TEXT NOT NULL,
+                city        TEXT NOT NULL,
+                state       TEXT NOT NULL,
+                row_index   INTEGER,
+                status      TEXT NOT NULL DEFAULT '',
+                attempts    INTEGER NOT NULL DEFAULT 0,
+                started_at  TEXT,
+                finished_at TEXT,
+                updated_at  TEXT,
+                error       TEXT,
+                PRIMARY KEY (country, city, state)
+            )
+        """)
+        # Lease columns, added in place to stores created before the fleet mode
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(jobs)").fetchall()}
+        for column in ("lease_owner", "lease_expires", "heartbeat_at"):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} TEXT")
+        # Mid-city progress: the parsed search results, then every finished hospital
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS search_checkpoints (
+                country    TEXT NOT NULL,
+                city       TEXT NOT NULL,
+                state      TEXT NOT NULL,
+                snapshot   TEXT NOT NULL,
+                updated_at TEXT,
+                PRIMARY KEY (country, city, state)
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS hospital_checkpoints (
+                country    TEXT NOT NULL,
+                city       TEXT NOT NULL,
+                state      TEXT NOT NULL,
+                hospital   TEXT NOT NULL,
+                record     TEXT NOT NULL,
+                updated_at TEXT,
+                PRIMARY KEY (country, city, state, hospital)
+            )
+        """)
+
+
+    def execute(self, sql, params=()):
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+
+    def import_sheet(self, country, df):
+        """
+        Adds the sheet's City/State rows. A city the store already has keeps its
+        status, unless the sheet marks it done and the store does not.
+        """
+        rows = [
+            (country, str(row["City"]).strip(), str(row["State"]).strip(), int(index), str(row["Data"]).strip(), now_str(),
+             REFRESH_STATUS, *DONE_STATUSES, *DONE_STATUSES)
+            for index, row in df.iterrows()
+        ]
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.executemany(f"""
+                    INSERT INTO jobs (country, city, state, row_index, status, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (country, city, state) DO UPDATE SET
+                        row_index = excluded.row_index,
+                        status = CASE WHEN jobs.status = ? THEN jobs.status
+                                      WHEN jobs.status IN ({DONE_PLACEHOLDERS}) THEN jobs.status
+                                      WHEN excluded.status IN ({DONE_PLACEHOLDERS}) THEN excluded.status
+                                      ELSE jobs.status END
+                """, rows)
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        logger.info(f"Imported {len(rows)} {country} cities into job store {self.db_path}")
+
+
+    def pending(self, country):
+        """(row_index, city, state) of every city still to do, in sheet order."""
+        rows = self.execute(
+            f"SELECT row_index, city, state FROM jobs WHERE country = ? AND status NOT IN ({DONE_PLACEHOLDERS}) ORDER BY row_index",
+            (country, *DONE_STATUSES),
+        )
+        return [(row["row_index"], row["city"], row["state"]) for row in rows]
+
+
+    def requeue(self, country=None, older_than=None):
+        """
+        Marks done cities (finished more than `older_than` seconds ago, if given)
+        for a refresh run. Returns their (country, city, state).
+        """
+        where = f"""
+            WHERE status IN ({DONE_PLACEHOLDERS})
+              AND (? IS NULL OR country = ?)
+              AND (? IS NULL OR finished_at IS NULL OR finished_at < ?)
+        """
+        cutoff = now_str(-older_than) if older_than else None
+        params = (*DONE_STATUSES, country, country, cutoff, cutoff)
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self.conn.execute(f"SELECT country, city, state FROM jobs {where}", params).fetchall()
+                self.conn.execute(
+                    f"UPDATE jobs SET status = ?, attempts = 0, error = NULL, updated_at = ? {where}",
+                    (REFRESH_STATUS, now_str(), *params),
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return [(row["country"], row["city"], row["state"]) for row in rows]
+
+
+    def start(self, country, city, state):
+        self.execute(
+            "UPDATE jobs SET status = 'in progress', started_at = ?, updated_at = ? WHERE country = ? AND city = ? AND state = ?",
+            (now_str(), now_str(), country, str(city).strip(), str(state).strip()),
+        )
+
+
+    def finish(self, country, city, state, status, error=None, count_attempt=True, owner=None):
+        """
+        Records an attempt's outcome; an empty status leaves the city pending.
+        Claimed cities already counted their attempt in `claim`. With `owner`
+        the outcome is only written while that owner still holds the lease.
+        Returns False when it was reclaimed by another node in the meantime.
+        """
+        with self.lock:
+            cursor = self.conn.execute("""
+                UPDATE jobs SET status = ?, attempts = attempts + ?, finished_at = ?, updated_at = ?, error = ?,
+                                lease_owner = NULL, lease_expires = NULL
+                WHERE country = ? AND city = ? AND state = ? AND (? IS NULL OR lease_owner = ?)
+            """, (status or "", int(count_attempt), now_str(), now_str(), error,
+                  country, str(city).strip(), str(state).strip(), owner, owner))
+            return cursor.rowcount == 1
+
+
+    def claim(self, owner, lease_seconds=900, max_attempts=3, country=None):
+        """
+        Leases the next pending city to `owner`: (country, row_index, city, state),
+        or None when nothing is claimable. Cities whose lease ran out (dead node)
+        are claimable again; cities already tried `max_attempts` times are not.
+        """
+        now = utc_str()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.conn.execute(f"""
+                    SELECT country, row_index, city, state FROM jobs
+                    WHERE status NOT IN ({DONE_PLACEHOLDERS})
+                      AND attempts < ?
+                      AND (lease_expires IS NULL OR lease_expires < ?)
+                      AND (? IS NULL OR country = ?)
+                    ORDER BY country, row_index
+                    LIMIT 1
+                """, (*DONE_STATUSES, max_attempts, now, country, country)).fetchone()
+                if row is not None:
+                    self.conn.execute("""
+                        UPDATE jobs SET status = 'in progress', attempts = attempts + 1, lease_owner = ?,
+                                        lease_expires = ?, heartbeat_at = ?, started_at = ?, updated_at = ?
+                        WHERE country = ? AND city = ? AND state = ?
+                    """, (owner, utc_str(lease_seconds), now, now_str(), now_str(), row["country"], row["city"], row["state"]))
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return (row["country"], row["row_index"], row["city"], row["state"]) if row is not None else None
+
+
+    def heartbeat(self, owner, country, city, state, lease_seconds=900):
+        """Extends `owner`'s lease. False means the lease was lost to another node."""
+        with self.lock:
+            cursor = self.conn.execute("""
+                UPDATE jobs SET lease_expires = ?, heartbeat_at = ?
+                WHERE country = ? AND city = ? AND state = ? AND lease_owner = ?
+            """, (utc_str(lease_seconds), utc_str(), country, str(city).strip(), str(state).strip(), owner))
+            return cursor.rowcount == 1
+
+
+    def leases(self):
+        """Cities currently leased: [(owner, country, city, state, lease_expires, heartbeat_at)]."""
+        rows = self.execute(
+            "SELECT lease_owner, country, city, state, lease_expires, heartbeat_at FROM jobs WHERE lease_owner IS NOT NULL"
+        )
+        return [tuple(row) for row in rows]
+
+
+    def statuses(self, country):
+        rows = self.execute("SELECT city, state, status FROM jobs WHERE country = ?", (country,))
+        return {(row["city"], row["state"]): row["status"] for row in rows}
+
+
+    def export_sheet(self, country, df):
+        """Copies the store's statuses into the sheet's `Data` column (in place)."""
+        statuses = self.statuses(country)
+        for index, row in df.iterrows():
+            status = statuses.get((str(row["City"]).strip(), str(row["State"]).strip()))
+            if status and status not in ("in progress", REFRESH_STATUS):
+                df.at[index, "Data"] = status
+        return df
+
+
+    def save_search(self, country, city, state, snapshot):
+        """Checkpoints the parsed search results of a city (see AahaScraper.search_snapshot)."""
+        self.execute(
+            "INSERT OR REPLACE INTO search_checkpoints (country, city, state, snapshot, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (country, str(city).strip(), str(state).strip(), json.dumps(snapshot), now_str()),
+        )
+
+
+    def load_search(self, country, city, state):
+        rows = self.execute(
+            "SELECT snapshot FROM search_checkpoints WHERE country = ? AND city = ? AND state = ?",
+            (country, str(city).strip(), str(state).strip()),
+        )
+        return json.loads(rows[0]["snapshot"]) if rows else None
+
+
+    def save_hospital(self, country, city, state, hospital, record):
+        """Checkpoints one fully extracted hospital entry."""
+        self.execute(
+            "INSERT OR REPLACE INTO hospital_checkpoints (country, city, state, hospital, record, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (country, str(city).strip(), str(state).strip(), hospital, json.dumps(record), now_str()),
+        )
+
+
+    def load_hospitals(self, country, city, state):
+        """{hospital name: record} of the hospitals already extracted for a city."""
+        rows = self.execute(
+            "SELECT hospital, record FROM hospital_checkpoints WHERE country = ? AND city = ? AND state = ?",
+            (country, str(city).strip(), str(state).strip()),
+        )
+        return {row["hospital"]: json.loads(row["record"]) for row in rows}
+
+
+    def clear_checkpoints(self, country, city, state):
+        """Drops a city's checkpoints once its output is saved."""
+        params = (country, str(city).strip(), str(state).strip())
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute("DELETE FROM search_checkpoints WHERE country = ? AND city = ? AND state = ?", params)
+                self.conn.execute("DELETE FROM hospital_checkpoints WHERE country = ? AND city = ? AND state = ?", params)
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+
+    def counts(self):
+        rows = self.execute("SELECT status, COUNT(*) AS total FROM jobs GROUP BY status")
+        return {row["status"] or "pending": row["total"] for row in rows}
+
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
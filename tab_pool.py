@@ -0,0 +1,126 @@
+import time
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+# Once the tab has left the page it was on : "ready" when the new page can be parsed,
+# "blocked" on the verification page (it never gets the ready element), null otherwise
+READY_SCRIPT = """
+if (window.__tabPoolStale || document.readyState !== 'complete') return null;
+if (document.getElementById(arguments[0])) return 'ready';
+if (document.body && document.body.innerText.indexOf(arguments[1]) !== -1) return 'blocked';
+return null;
+"""
+BLOCKED_MARKER = "we could not verify your request"
+
+
+class TabPool:
+    """
+    Bounded pool of tabs inside one WebDriver session. Keeps up to `size`
+    pages loading at the same time and hands each finished page to a handler
+    (with the driver switched to that tab), so page loads overlap without
+    starting another Chrome process.
+    """
+    def __init__(self, driver, size=3, ready_element_id="hospitalLocatorDetailsAboveMap", timeout=60,
+                 pacer=None, setup_tab=None, on_wait=None):
+        self.driver = driver
+        self.pacer = pacer
+        # Called with the seconds the pacer made a navigation wait (metrics)
+        self.on_wait = on_wait
+        self.setup_tab = setup_tab
+        self.size = size
+        self.ready_element_id = ready_element_id
+        self.timeout = timeout
+
+
+    def _new_tab(self):
+        self.driver.switch_to.new_window('tab')
+        if self.setup_tab is not None:
+            # Per-tab CDP setup (resource blocking), applied before the first navigation
+            self.setup_tab()
+        return self.driver.current_window_handle
+
+
+    def _start(self, handle, url):
+        """Starts a non-blocking navigation in `handle`."""
+        if self.pacer is not None:
+            waited = self.pacer.acquire()
+            if self.on_wait is not None:
+                self.on_wait(waited)
+        self.driver.switch_to.window(handle)
+        self.driver.execute_script("window.__tabPoolStale = true; window.location.href = arguments[0];", url)
+
+
+    def _page_state(self):
+        """"ready", "blocked" or None while the page is still loading."""
+        try:
+            return self.driver.execute_script(READY_SCRIPT, self.ready_element_id, BLOCKED_MARKER)
+        except Exception:
+            # Page is mid-navigation
+            return None
+
+
+    def run(self, jobs, handler):
+        """
+        jobs    : list of (name, url)
+        handler : called as handler(name) once that page is ready, returns True/False
+        Returns {name: result}; pages that time out or land on the verification
+        page count as False.
+        """
+        origin = self.driver.current_window_handle
+        pending = list(jobs)
+        in_flight = {}
+        free_tabs = []
+        opened = []
+        results = {}
+        try:
+            while pending or in_flight:
+                while pending and len(in_flight) < self.size:
+                    name, url = pending.pop(0)
+                    if free_tabs:
+                        handle = free_tabs.pop()
+                    else:
+                        handle = self._new_tab()
+                        opened.append(handle)
+                    self._start(handle, url)
+                    in_flight[handle] = (name, time.monotonic())
+
+                progressed = False
+                for handle, (name, started) in list(in_flight.items()):
+                    self.driver.switch_to.window(handle)
+                    state = self._page_state()
+                    if state == "ready":
+                        try:
+                            results[name] = handler(name)
+                        except Exception as e:
+                            logger.error(f"Error processing tab for {name}: {e}")
+                            results[name] = False
+                    elif state == "blocked":
+                        logger.warning(f"Verification page instead of the details page for {name}")
+                        results[name] = False
+                        if self.pacer is not None:
+                            self.pacer.on_block("verification page on details page")
+                    elif time.monotonic() - started > self.timeout:
+                        logger.warning(f"Timed out loading details page for {name}")
+                        results[name] = False
+                        if self.pacer is not None:
+                            self.pacer.on_slow("details page timeout")
+                    else:
+                        continue
+                    logger.info(f"Extraction status ---> {results[name]} ({name})")
+                    del in_flight[handle]
+                    free_tabs.append(handle)
+                    progressed = True
+
+                if not progressed:
+                    time.sleep(0.25)
+        finally:
+            for handle in opened:
+                try:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+                except Exception:
+                    pass
+            self.driver.switch_to.window(origin)
+        return results
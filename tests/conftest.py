@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+
+@pytest.fixture
+def job_store(tmp_path):
+    from state_store import JobStore
+    store = JobStore(str(tmp_path / "state" / "jobs.sqlite3"))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def sheet():
+    """Builds an input sheet (City / State / Data) from (city, state, data) rows."""
+    import pandas as pd
+
+    def build(*rows):
+        return pd.DataFrame(list(rows), columns=["City", "State", "Data"])
+    return build
@@ -0,0 +1,60 @@
+from coverage_planner import haversine_miles, known_geometry, plan_searches
+
+AUSTIN = (30.2672, -97.7431)
+ROUND_ROCK = (30.5083, -97.6789)
+DALLAS = (32.7767, -96.7970)
+
+
+def centers(**points):
+    return {(city.replace("_", " ").lower(), "tx"): point for city, point in points.items()}
+
+
+def test_haversine_miles():
+    assert haversine_miles(AUSTIN, AUSTIN) == 0
+    assert 16 < haversine_miles(AUSTIN, ROUND_ROCK) < 18
+    assert 180 < haversine_miles(AUSTIN, DALLAS) < 185
+
+
+def test_known_geometry_reads_centres_and_hospitals():
+    records = [
+        {"city": "Austin", "state": "TX", "locations": [
+            {"name": "Your Location", "lat": AUSTIN[0], "lng": AUSTIN[1]},
+            {"name": "Vet A", "recno": "17", "lat": "30.27", "lng": "-97.74"},
+            {"name": "No position", "lat": None, "lng": None},
+        ]},
+    ]
+    found_centers, hospitals = known_geometry(records)
+    assert found_centers == {("austin", "tx"): AUSTIN}
+    assert hospitals == {"17": (30.27, -97.74)}
+
+
+def test_unknown_cities_keep_the_default_radius():
+    plan = plan_searches([("Austin", "TX"), ("Waco", "TX")], {}, {}, default_radius=20)
+    assert plan.searches == [("Austin", "TX", 20, []), ("Waco", "TX", 20, [])]
+    assert plan.covered_count() == 0
+
+
+def test_one_wide_search_covers_a_sparse_neighbour():
+    cities = [("Austin", "TX"), ("Round Rock", "TX"), ("Dallas", "TX")]
+    hospitals = {"a": AUSTIN, "b": ROUND_ROCK}
+    plan = plan_searches(cities, centers(austin=AUSTIN, round_rock=ROUND_ROCK), hospitals, radii=(5, 20, 50))
+
+    # Dallas has no known centre and is searched as before
+    assert ("Dallas", "TX", 20, []) in plan.searches
+    planned = [search for search in plan.searches if search[0] != "Dallas"]
+    assert len(planned) == 1
+    city, _, radius, covers = planned[0]
+    assert radius == 20
+    assert covers == [("Round Rock", "TX") if city == "Austin" else ("Austin", "TX")]
+    assert plan.covered_count() == 1
+
+
+def test_dense_area_keeps_small_searches():
+    cities = [("Austin", "TX"), ("Round Rock", "TX")]
+    # Too many hospitals around Austin for a search wide enough to reach Round Rock
+    hospitals = {f"h{i}": (AUSTIN[0] + i * 0.001, AUSTIN[1]) for i in range(10)}
+    hospitals["rr"] = ROUND_ROCK
+    plan = plan_searches(cities, centers(austin=AUSTIN, round_rock=ROUND_ROCK), hospitals,
+                         radii=(5, 20), max_results=5)
+    assert plan.covered_count() == 0
+    assert {(city, radius) for city, _, radius, _ in plan.searches} == {("Austin", 5), ("Round Rock", 5)}
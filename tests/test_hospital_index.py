@@ -0,0 +1,54 @@
+import json
+from datetime import datetime, timedelta
+
+from hospital_index import HospitalIndex, hospital_key
+
+
+def test_hospital_key_prefers_the_record_number():
+    assert hospital_key({"recno": "17", "name": "Vet"}) == "recno:17"
+    assert hospital_key({"name": " Vet ", "lat": "30.123456", "lng": -97.1}) == "vet|30.12346|-97.1"
+
+
+def test_add_and_apply_copy_only_detail_fields(tmp_path):
+    index = HospitalIndex(str(tmp_path / "hospital_index.sqlite3"))
+    index.add("recno:1", {"Name": "Vet", "Email": "a@example.com", "Distance": "3 mi"}, location_fp="fp1")
+    entry = {"Name": "Vet", "Distance": "5 mi"}
+    assert index.apply("recno:1", entry, location_fp="fp1")
+    assert entry == {"Name": "Vet", "Distance": "5 mi", "Email": "a@example.com"}
+    assert not index.apply("recno:2", {})
+    index.close()
+
+
+def test_changed_or_old_records_are_not_fresh(tmp_path):
+    index = HospitalIndex(str(tmp_path / "hospital_index.sqlite3"))
+    index.add("recno:1", {"Name": "Vet"}, location_fp="fp1")
+    record = index.get("recno:1")
+    assert index.is_fresh(record, location_fp="fp1", max_age=60)
+    assert not index.is_fresh(record, location_fp="fp2")
+    record["seen_at"] = (datetime.now() - timedelta(hours=2)).isoformat(timespec="seconds")
+    assert not index.is_fresh(record, max_age=3600)
+    index.close()
+
+
+def test_connections_only_write_their_own_keys(tmp_path):
+    db_path = str(tmp_path / "hospital_index.sqlite3")
+    first, second = HospitalIndex(db_path), HospitalIndex(db_path)
+    first.add("recno:1", {"Name": "A"})
+    second.add("recno:2", {"Name": "B"})
+    first.add("recno:1", {"Name": "A", "Email": "a@example.com"})
+    assert second.get("recno:1")["Email"] == "a@example.com"
+    assert first.get("recno:2")["Name"] == "B"
+    first.close()
+    second.close()
+
+
+def test_legacy_json_index_is_imported_once(tmp_path):
+    (tmp_path / "hospital_index.json").write_text(json.dumps({"recno:1": {"Name": "Old", "seen_at": "2026-01-01T00:00:00"}}))
+    db_path = str(tmp_path / "hospital_index.sqlite3")
+    index = HospitalIndex(db_path)
+    assert index.get("recno:1")["Name"] == "Old"
+    index.add("recno:1", {"Name": "New"})
+    index.close()
+    index = HospitalIndex(db_path)
+    assert index.get("recno:1")["Name"] == "New"
+    index.close()
@@ -0,0 +1,64 @@
+from incremental import detail_fingerprint, diff_locations, location_fingerprint
+
+YOU_ARE_HERE = {"name": "Your Location", "lat": 30.0, "lng": -97.0}
+
+
+def hospital(recno, name, lat=30.1, lng=-97.1, **fields):
+    return {"recno": recno, "name": name, "address": "1 Main St", "phone": "555", "lat": lat, "lng": lng,
+            "icon": "accredited", **fields}
+
+
+def test_diff_sorts_every_kind_of_change():
+    old = [
+        YOU_ARE_HERE,
+        hospital("1", "Same Vet"),
+        hospital("2", "Old Name Vet"),
+        hospital("3", "Moving Vet"),
+        hospital("4", "New Phone Vet"),
+        hospital("5", "Closed Vet"),
+    ]
+    new = [
+        hospital("1", "Same Vet"),
+        hospital("2", "New Name Vet"),
+        hospital("3", "Moving Vet", lat=30.2),
+        hospital("4", "New Phone Vet", phone="556"),
+        hospital("6", "Opened Vet"),
+    ]
+    assert diff_locations(old, new) == {
+        "added": ["Opened Vet"],
+        "removed": ["Closed Vet"],
+        "moved": ["Moving Vet"],
+        "renamed": ["New Name Vet"],
+        "changed": ["New Phone Vet"],
+        "unchanged": ["Same Vet"],
+    }
+
+
+def test_geocoding_noise_is_not_a_move():
+    old = [hospital("1", "Vet", lat=30.10000)]
+    new = [hospital("1", "Vet", lat=30.10003)]
+    assert diff_locations(old, new)["unchanged"] == ["Vet"]
+
+
+def test_first_search_only_adds():
+    diff = diff_locations(None, [YOU_ARE_HERE, hospital("1", "Vet")])
+    assert diff["added"] == ["Vet"]
+    assert not any(diff[kind] for kind in ("removed", "moved", "renamed", "changed", "unchanged"))
+
+
+def test_hospitals_without_recno_are_matched_by_name_and_position():
+    old = [{"name": "Vet", "lat": "30.1", "lng": "-97.1", "phone": "555"}]
+    new = [{"name": " Vet ", "lat": 30.1, "lng": -97.1, "phone": "556"}]
+    assert diff_locations(old, new)["changed"] == ["Vet"]
+
+
+def test_location_fingerprint_ignores_formatting():
+    assert location_fingerprint({"name": " Vet ", "lat": "30.10001", "lng": -97.1}) == \
+        location_fingerprint({"name": "Vet", "lat": 30.1, "lng": "-97.1"})
+    assert location_fingerprint(hospital("1", "Vet")) != location_fingerprint(hospital("1", "Vet", phone="556"))
+
+
+def test_detail_fingerprint_only_reads_detail_fields():
+    entry = {"Name": "Vet", "Email": "a@example.com", "Hospital Hours": {"Mon": "9-5"}}
+    assert detail_fingerprint(entry) == detail_fingerprint({**entry, "Distance": "3 mi"})
+    assert detail_fingerprint(entry) != detail_fingerprint({**entry, "Email": "b@example.com"})
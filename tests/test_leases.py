@@ -0,0 +1,48 @@
+import pytest
+
+
+@pytest.fixture
+def seeded(job_store, sheet):
+    job_store.import_sheet("US", sheet(("Austin", "TX", ""), ("Dallas", "TX", "")))
+    return job_store
+
+
+def test_claim_hands_each_city_to_one_owner(seeded):
+    assert seeded.claim("node-a") == ("US", 0, "Austin", "TX")
+    assert seeded.claim("node-b") == ("US", 1, "Dallas", "TX")
+    assert seeded.claim("node-c") is None
+    assert {owner for owner, *_ in seeded.leases()} == {"node-a", "node-b"}
+
+
+def test_expired_lease_is_claimable_again(seeded):
+    seeded.claim("node-a", lease_seconds=-1)
+    assert seeded.claim("node-b") == ("US", 0, "Austin", "TX")
+    assert not seeded.heartbeat("node-a", "US", "Austin", "TX")
+    assert seeded.heartbeat("node-b", "US", "Austin", "TX")
+
+
+def test_finish_by_a_stale_owner_is_ignored(seeded):
+    seeded.claim("node-a", lease_seconds=-1)
+    seeded.claim("node-b")
+    assert not seeded.finish("US", "Austin", "TX", "added", count_attempt=False, owner="node-a")
+    assert seeded.statuses("US")[("Austin", "TX")] == "in progress"
+    assert seeded.finish("US", "Austin", "TX", "added", count_attempt=False, owner="node-b")
+    assert seeded.statuses("US")[("Austin", "TX")] == "added"
+    assert seeded.leases() == []
+
+
+def test_claim_stops_at_max_attempts(seeded):
+    for _ in range(2):
+        country, _, city, state = seeded.claim("node-a", max_attempts=2, country="US")
+        assert city == "Austin"
+        seeded.finish(country, city, state, "search failed", count_attempt=False, owner="node-a")
+    # Austin used up its attempts, Dallas is next
+    assert seeded.claim("node-a", max_attempts=2)[2] == "Dallas"
+    seeded.finish("US", "Dallas", "TX", "added", count_attempt=False, owner="node-a")
+    assert seeded.claim("node-a", max_attempts=2) is None
+
+
+def test_claim_filters_by_country(seeded, sheet):
+    seeded.import_sheet("Canada", sheet(("Toronto", "ON", "")))
+    assert seeded.claim("node-a", country="Canada") == ("Canada", 0, "Toronto", "ON")
+    assert seeded.claim("node-a", country="Canada") is None
@@ -0,0 +1,37 @@
+import pytest
+
+from locations_store import LocationsStore
+
+
+@pytest.fixture(params=[False, True], ids=["plain", "gzip"])
+def store(tmp_path, request):
+    return LocationsStore(str(tmp_path / "locations"), compress=request.param)
+
+
+def test_get_returns_the_newest_record(store):
+    store.append("US", "Austin", "TX", [{"name": "Old Vet"}], miles=20)
+    store.append("US", "Dallas", "TX", '[{"name": "Dallas Vet"}]')
+    store.append("US", "Austin", "TX", [{"name": "New Vet"}], miles=50)
+    record = store.get("Austin", "TX")
+    assert record["locations"] == [{"name": "New Vet"}]
+    assert record["miles"] == 50
+    # JSON text payloads are stored parsed
+    assert store.get("Dallas", "TX")["locations"] == [{"name": "Dallas Vet"}]
+    assert store.get("Waco", "TX") is None
+
+
+def test_index_picks_up_records_written_by_another_instance(store):
+    store.append("US", "Austin", "TX", [{"name": "A"}])
+    assert set(store.index()) == {"Austin_TX"}
+    other = LocationsStore(store.root, compress=store.compress)
+    other.append("US", "Dallas", "TX", [{"name": "D"}])
+    assert set(store.index()) == {"Austin_TX", "Dallas_TX"}
+    assert [record["city"] for record in store.iter_records()] == ["Austin", "Dallas"]
+
+
+def test_torn_index_line_is_skipped(store):
+    path = store.append("US", "Austin", "TX", [{"name": "A"}])
+    with open(store.index_path(path), 'a', encoding='utf-8') as file:
+        file.write('{"key": "Dallas_TX", "off\n')
+    assert set(store.index()) == {"Austin_TX"}
+    assert store.get("Austin", "TX")["locations"] == [{"name": "A"}]
@@ -0,0 +1,65 @@
+import glob
+import os
+
+import pandas as pd
+import pytest
+
+import output_sink
+from output_sink import OutputSink, normalize
+
+FORMATS = ["csv", pytest.param("parquet", marks=pytest.mark.skipif(output_sink.pa is None, reason="needs pyarrow"))]
+
+
+def entry(name, email="a@example.com", **fields):
+    return {
+        "Name": name, "Address": f"{name} St", "Email": email,
+        "Veterinarians": ["Dr. A", "Dr. B"], "Species Treated": "Dogs",
+        "Social Media": {"facebook": "https://facebook.com/vet"}, "Hospital Hours": [],
+        **fields,
+    }
+
+
+def test_normalize_types_nested_fields():
+    row = normalize(entry("Vet"), "United States", "round rock", "TX", "recno:1", "2026-01-01T00:00:00")
+    assert row["City"] == "Round Rock"
+    assert row["Key"] == "recno:1"
+    assert row["Veterinarians"] == ["Dr. A", "Dr. B"]
+    assert row["Species Treated"] == ["Dogs"]
+    assert row["Social Media"] == [{"name": "facebook", "url": "https://facebook.com/vet"}]
+    assert row["Hospital Hours"] == []
+
+
+def test_dedupe_keeps_the_newest_row_per_hospital():
+    df = pd.DataFrame({
+        "Key": ["recno:1", "recno:1", "", ""],
+        "Name": ["Vet", "Vet", "Other", "Other"],
+        "Address": ["1 St", "1 St", "2 St", "2 St"],
+        "Email": ["old", "new", "old", "new"],
+        "Scraped At": ["2026-01-02", "2026-01-03", "2026-01-01", "2026-01-04"],
+    })
+    assert sorted(OutputSink.dedupe(df)["Email"]) == ["new", "new"]
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_compact_merges_parts_into_one_deduplicated_file(tmp_path, fmt):
+    sink = OutputSink(str(tmp_path), fmt=fmt)
+    keys = {"Vet": "recno:1", "Other": "recno:2"}
+    sink.write([entry("Vet", email="old"), entry("Other")], "United States", "Austin", "TX", keys=keys)
+    sink.write([entry("Vet", email="new")], "United States", "Round Rock", "TX", keys=keys)
+    sink.write([entry("Toronto Vet")], "Canada", "Toronto", "ON")
+
+    sink.compact(country="United States")
+
+    parts = glob.glob(os.path.join(sink.partition_path("United States", "TX"), "*"))
+    assert len(parts) == 1 and os.path.basename(parts[0]).startswith("compacted-")
+    df = sink.read("United States")
+    assert sorted(df["Name"]) == ["Other", "Vet"]
+    assert df.set_index("Name").loc["Vet", "Email"] == "new"
+    assert list(df.set_index("Name").loc["Vet", "Veterinarians"]) == ["Dr. A", "Dr. B"]
+    # Other countries are left alone
+    assert len(glob.glob(os.path.join(sink.partition_path("Canada", "ON"), "part-*"))) == 1
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        OutputSink(str(tmp_path), fmt="xml")
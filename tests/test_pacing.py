@@ -0,0 +1,77 @@
+import pytest
+
+import pacing
+from pacing import RateController, shared_state
+
+
+class Clock:
+    """Fake monotonic clock; sleeping advances it."""
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(pacing.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(pacing.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_success_adds_and_failures_multiply(clock):
+    pacer = RateController(rate=0.5, min_rate=0.1, max_rate=1.0, increase=0.1, slow_decrease=0.5, block_decrease=0.25)
+    pacer.on_success()
+    assert pacer.rate == pytest.approx(0.6)
+    pacer.on_slow()
+    assert pacer.rate == pytest.approx(0.3)
+    pacer.on_block()
+    assert pacer.rate == pytest.approx(0.1)  # 0.075, held at min_rate
+    for _ in range(20):
+        pacer.on_success()
+    assert pacer.rate == pytest.approx(1.0)  # held at max_rate
+
+
+def test_acquire_spaces_navigations_by_the_rate(clock):
+    pacer = RateController(rate=0.5, burst=1)
+    assert pacer.acquire() == 0
+    assert pacer.acquire() == pytest.approx(2.0)
+    clock.now += 5
+    assert pacer.acquire() == 0
+
+
+def test_block_holds_every_navigation_for_the_cooldown(clock):
+    pacer = RateController(rate=1.0, block_decrease=0.5, cooldown=30)
+    pacer.acquire()
+    pacer.on_block()
+    assert pacer.acquire() == pytest.approx(30)
+    assert pacer.rate == pytest.approx(0.5)
+
+
+def test_listeners_see_every_event_and_may_fail(clock):
+    events = []
+    pacer = RateController()
+    pacer.listeners.append(lambda event, reason: events.append((event, reason)))
+    pacer.listeners.append(lambda event, reason: 1 / 0)
+    pacer.on_success()
+    pacer.on_slow("timeout")
+    pacer.on_block("captcha")
+    assert events == [("success", None), ("slow", "timeout"), ("block", "captcha")]
+
+
+def test_controllers_on_one_shared_state_pace_together(clock):
+    state = shared_state(rate=0.5, burst=1)
+    first, second = RateController(rate=0.5, state=state), RateController(rate=0.5, state=state)
+    assert first.acquire() == 0
+    # The token the first controller took is gone for the second one too
+    assert second.acquire() == pytest.approx(2.0)
+    second.on_block()
+    assert first.rate == pytest.approx(second.rate)
+    assert first.acquire() >= first.cooldown
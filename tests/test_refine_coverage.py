@@ -0,0 +1,83 @@
+"""
+A "Please refine your search criteria" answer is not a confirmed empty area:
+the locator gives it for too many results too, so it must never mark the
+cities a planned search was meant to cover.
+"""
+import pytest
+
+import scraper
+
+
+class FakeDriver:
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def aaha_scraper(tmp_path, monkeypatch, job_store):
+    # Every store the scraper opens goes to the test's folder instead of output/
+    for name in dir(scraper):
+        value = getattr(scraper, name)
+        if name.endswith(("_FOLDER", "_PATH")) and isinstance(value, str) and value.startswith(scraper.OUTPUT_FOLDER):
+            monkeypatch.setattr(scraper, name, str(tmp_path) + value[len(scraper.OUTPUT_FOLDER):])
+    aaha_scraper = scraper.AahaScraper()
+    aaha_scraper.job_store = job_store
+    aaha_scraper.pause = lambda *args, **kwargs: None
+    aaha_scraper.visit_random_sites = lambda: None
+    aaha_scraper.export_input_sheets = lambda df_dict: None
+    aaha_scraper.sessions.acquire = FakeDriver
+    yield aaha_scraper
+    aaha_scraper.search_cache.close()
+    aaha_scraper.hospital_index.close()
+
+
+def answer(aaha_scraper, outcomes):
+    """open_search_page stub : the status for each search, by radius. Returns the searches made."""
+    searches = []
+
+    def open_search_page(refresh=False, miles=None):
+        searches.append((aaha_scraper.city, aaha_scraper.search_miles))
+        return True, outcomes[aaha_scraper.search_miles]
+    aaha_scraper.open_search_page = open_search_page
+    return searches
+
+
+def test_refine_on_a_wide_search_retries_at_the_plain_radius(aaha_scraper):
+    searches = answer(aaha_scraper, {50: "refine", scraper.SEARCH_RADIUS: "refine"})
+    status = aaha_scraper.scrape_city("United States", "Austin", "TX", miles=50)
+    assert searches == [("Austin", 50), ("Austin", scraper.SEARCH_RADIUS)]
+    assert status == "not found"
+    assert aaha_scraper.search_refined
+
+
+def test_refine_never_marks_covered_cities(aaha_scraper, sheet):
+    df = sheet(("Austin", "TX", ""), ("Round Rock", "TX", ""), ("Pflugerville", "TX", ""))
+    aaha_scraper.plan_country = lambda pending: [("Austin", "TX", 50, [("Round Rock", "TX"), ("Pflugerville", "TX")])]
+    searches = answer(aaha_scraper, {50: "refine", scraper.SEARCH_RADIUS: "refine"})
+
+    aaha_scraper.process_country_df({"United States": [df, "input.xlsx"]})
+
+    statuses = aaha_scraper.job_store.statuses("United States")
+    assert "covered" not in statuses.values()
+    # The cities the wide search was meant to cover are searched on their own
+    assert ("Round Rock", scraper.SEARCH_RADIUS) in searches
+    assert ("Pflugerville", scraper.SEARCH_RADIUS) in searches
+    assert statuses == {("Austin", "TX"): "not found", ("Round Rock", "TX"): "not found",
+                        ("Pflugerville", "TX"): "not found"}
+
+
+def test_listed_results_mark_covered_cities(aaha_scraper, sheet):
+    df = sheet(("Austin", "TX", ""), ("Round Rock", "TX", ""))
+    aaha_scraper.plan_country = lambda pending: [("Austin", "TX", 50, [("Round Rock", "TX")])]
+    searched = []
+
+    def scrape_city(country, city, state, miles=None):
+        searched.append(city)
+        aaha_scraper.search_refined = False
+        return "added"
+    aaha_scraper.scrape_city = scrape_city
+
+    aaha_scraper.process_country_df({"United States": [df, "input.xlsx"]})
+
+    assert searched == ["Austin"]
+    assert aaha_scraper.job_store.statuses("United States") == {("Austin", "TX"): "added", ("Round Rock", "TX"): "covered"}
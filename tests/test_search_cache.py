@@ -0,0 +1,93 @@
+import pytest
+
+import search_cache
+from search_cache import SearchCache
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(search_cache.time, "time", clock.time)
+    return clock
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    caches = []
+
+    def make(**kwargs):
+        cache = SearchCache(str(tmp_path / "json" / "search_cache.sqlite3"), **kwargs)
+        caches.append(cache)
+        return cache
+    yield make
+    for cache in caches:
+        cache.close()
+
+
+def snapshot(name):
+    return {"hospital_names": [name], "hospital_links": {name: f"https://example.com/{name}"}}
+
+
+def test_hit_is_keyed_by_city_and_radius(make_cache, clock):
+    cache = make_cache()
+    cache.put("US", "Austin", "TX", 20, snapshot("A"))
+    assert cache.get("us", " austin ", "tx", 20) == snapshot("A")
+    assert cache.get("US", "Austin", "TX", 50) is None
+
+
+def test_entries_expire_after_the_ttl(make_cache, clock):
+    cache = make_cache(ttl=60)
+    cache.put("US", "Austin", "TX", 20, snapshot("A"))
+    clock.now += 59
+    assert cache.get("US", "Austin", "TX", 20) is not None
+    clock.now += 2
+    assert cache.get("US", "Austin", "TX", 20) is None
+    # The expired entry is gone, not only hidden
+    clock.now -= 61
+    assert cache.get("US", "Austin", "TX", 20) is None
+
+
+def test_zero_ttl_never_expires(make_cache, clock):
+    cache = make_cache(ttl=0)
+    cache.put("US", "Austin", "TX", 20, snapshot("A"))
+    clock.now += 10 * 365 * 24 * 3600
+    assert cache.get("US", "Austin", "TX", 20) == snapshot("A")
+
+
+def test_least_recently_used_entry_is_evicted(make_cache, clock):
+    cache = make_cache(max_entries=2)
+    cache.put("US", "Austin", "TX", 20, snapshot("A"))
+    clock.now += 1
+    cache.put("US", "Dallas", "TX", 20, snapshot("D"))
+    clock.now += 1
+    cache.get("US", "Austin", "TX", 20)
+    clock.now += 1
+    cache.put("US", "Waco", "TX", 20, snapshot("W"))
+
+    assert cache.get("US", "Dallas", "TX", 20) is None
+    assert cache.get("US", "Austin", "TX", 20) == snapshot("A")
+    assert cache.get("US", "Waco", "TX", 20) == snapshot("W")
+
+
+def test_invalidate_drops_every_radius_of_one_city(make_cache, clock):
+    cache = make_cache()
+    for miles in (10, 20):
+        cache.put("US", "Austin", "TX", miles, snapshot("A"))
+    cache.put("US", "Austin City", "TX", 20, snapshot("B"))
+    cache.invalidate("US", "Austin", "TX")
+    assert cache.get("US", "Austin", "TX", 10) is None
+    assert cache.get("US", "Austin", "TX", 20) is None
+    assert cache.get("US", "Austin City", "TX", 20) == snapshot("B")
+
+
+def test_entries_are_shared_between_connections(make_cache, clock):
+    make_cache().put("US", "Austin", "TX", 20, snapshot("A"))
+    assert make_cache().get("US", "Austin", "TX", 20) == snapshot("A")
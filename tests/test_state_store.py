@@ -0,0 +1,69 @@
+from state_store import DONE_STATUSES, REFRESH_STATUS
+
+
+def test_import_keeps_sheet_order_and_skips_done(job_store, sheet):
+    job_store.import_sheet("US", sheet(("Austin", "TX", ""), ("Dallas", "TX", "added"), ("Waco", "TX", "")))
+    assert job_store.pending("US") == [(0, "Austin", "TX"), (2, "Waco", "TX")]
+
+
+def test_reimport_keeps_store_status(job_store, sheet):
+    job_store.import_sheet("US", sheet(("Austin", "TX", ""), ("Dallas", "TX", "")))
+    job_store.finish("US", "Austin", "TX", "not found")
+    # Stale sheet without the result, plus a city the sheet marks done
+    job_store.import_sheet("US", sheet(("Austin", "TX", ""), ("Dallas", "TX", "covered")))
+    assert job_store.statuses("US") == {("Austin", "TX"): "not found", ("Dallas", "TX"): "covered"}
+    assert job_store.pending("US") == []
+
+
+def test_failed_statuses_stay_pending(job_store, sheet):
+    job_store.import_sheet("US", sheet(("Austin", "TX", ""), ("Dallas", "TX", "")))
+    job_store.finish("US", "Austin", "TX", "blocked")
+    job_store.finish("US", "Dallas", "TX", "")
+    assert [city for _, city, _ in job_store.pending("US")] == ["Austin", "Dallas"]
+
+
+def test_quotes_in_names_and_statuses(job_store, sheet):
+    job_store.import_sheet("US", sheet(("O'Fallon", "MO", "")))
+    job_store.finish("US", "O'Fallon", "MO", "it's odd")
+    assert job_store.pending("US") == [(0, "O'Fallon", "MO")]
+
+
+def test_requeue_marks_done_cities_for_refresh(job_store, sheet):
+    job_store.import_sheet("US", sheet(*[(f"City {i}", "TX", "") for i in range(len(DONE_STATUSES) + 1)]))
+    for i, status in enumerate(DONE_STATUSES):
+        job_store.finish("US", f"City {i}", "TX", status)
+
+    requeued = job_store.requeue("US")
+
+    assert sorted(requeued) == [("US", f"City {i}", "TX") for i in range(len(DONE_STATUSES))]
+    assert set(job_store.statuses("US").values()) == {REFRESH_STATUS, ""}
+    assert len(job_store.pending("US")) == len(DONE_STATUSES) + 1
+    # A sheet that still says "added" does not undo the refresh
+    job_store.import_sheet("US", sheet(("City 0", "TX", "added")))
+    assert job_store.statuses("US")[("City 0", "TX")] == REFRESH_STATUS
+
+
+def test_requeue_older_than_skips_recent_cities(job_store, sheet):
+    job_store.import_sheet("US", sheet(("Austin", "TX", "")))
+    job_store.finish("US", "Austin", "TX", "added")
+    assert job_store.requeue("US", older_than=3600) == []
+
+
+def test_export_sheet_leaves_refresh_and_in_progress_out(job_store, sheet):
+    df = sheet(("Austin", "TX", "added"), ("Dallas", "TX", ""), ("Waco", "TX", ""))
+    job_store.import_sheet("US", df)
+    job_store.requeue("US")
+    job_store.start("US", "Dallas", "TX")
+    job_store.finish("US", "Waco", "TX", "not found")
+    job_store.export_sheet("US", df)
+    assert list(df["Data"]) == ["added", "", "not found"]
+
+
+def test_checkpoints_round_trip_and_clear(job_store):
+    job_store.save_search("US", "Austin", "TX", {"hospital_names": ["A"]})
+    job_store.save_hospital("US", "Austin", "TX", "A", {"Name": "A", "Email": "a@example.com"})
+    assert job_store.load_search("US", "Austin", "TX") == {"hospital_names": ["A"]}
+    assert job_store.load_hospitals("US", "Austin", "TX") == {"A": {"Name": "A", "Email": "a@example.com"}}
+    job_store.clear_checkpoints("US", "Austin", "TX")
+    assert job_store.load_search("US", "Austin", "TX") is None
+    assert job_store.load_hospitals("US", "Austin", "TX") == {}
@@ -0,0 +1,100 @@
+import json
+import time
+import logging
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+logger = logging.getLogger(__name__)
+
+# Resolves once the DOM has had no mutations for `quiet_ms` (or after `timeout_ms`)
+DOM_QUIET_SCRIPT = r"""
+var quietMs = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var started = Date.now(), timer = null;
+var observer = new MutationObserver(function () { arm(); });
+function finish(quiet) { observer.disconnect(); clearTimeout(timer); clearTimeout(hardStop); done(quiet); }
+function arm() { clearTimeout(timer); timer = setTimeout(function () { finish(true); }, quietMs); }
+var hardStop = setTimeout(function () { finish(false); }, timeoutMs);
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+arm();
+"""
+
+
+def wait_for_document_ready(driver, timeout=20):
+    """Waits for document.readyState == 'complete'."""
+    WebDriverWait(driver, timeout).until(
+        lambda d: d.execute_script("return document.readyState;") == "complete"
+    )
+
+
+def wait_for_dom_quiet(driver, quiet_ms=300, timeout=10):
+    """Waits (MutationObserver) until the page stops re-rendering. Returns False on timeout."""
+    try:
+        driver.set_script_timeout(timeout + 5)
+        return bool(driver.execute_async_script(DOM_QUIET_SCRIPT, quiet_ms, int(timeout * 1000)))
+    except Exception as e:
+        logger.warning(f"DOM quiet wait failed: {e}")
+        return False
+
+
+def text_contains_any(locator, markers):
+    """
+    Expected condition: the element's text contains one of `markers`.
+    Returns the text, so it can be used just like the original `.text` lookups.
+    """
+    def condition(driver):
+        try:
+            text = driver.find_element(*locator).text.strip()
+        except Exception:
+            return False
+        return text if any(marker in text for marker in markers) else False
+    return condition
+
+
+class NetworkIdleTracker:
+    """
+    Follows the CDP Network domain events that chromedriver writes to the
+    `performance` log (see `goog:loggingPrefs` in get_driver) and reports when
+    the page has no more than `max_inflight` requests open for `idle_time` seconds.
+    The log has to be drained regularly or chromedriver keeps buffering it.
+    """
+    def __init__(self, driver, max_inflight=2):
+        self.driver = driver
+        self.max_inflight = max_inflight
+        self.inflight = set()
+
+
+    def drain(self):
+        """Consumes pending log entries. Returns how many network events were seen."""
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception:
+            return 0
+        events = 0
+        for entry in entries:
+            message = json.loads(entry["message"]).get("message", {})
+            method = message.get("method", "")
+            request_id = message.get("params", {}).get("requestId")
+            if method == "Network.requestWillBeSent":
+                self.inflight.add(request_id)
+            elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                self.inflight.discard(request_id)
+            else:
+                continue
+            events += 1
+        return events
+
+
+    def wait_idle(self, idle_time=0.5, timeout=15):
+        """Returns True once the network has been idle for `idle_time`, False on timeout."""
+        deadline = time.monotonic() + timeout
+        last_activity = time.monotonic()
+        while time.monotonic() < deadline:
+            if self.drain():
+                last_activity = time.monotonic()
+            if len(self.inflight) <= self.max_inflight and time.monotonic() - last_activity >= idle_time:
+                return True
+            time.sleep(0.1)
+        logger.warning(f"Network not idle after {timeout}s ({len(self.inflight)} requests in flight)")
+        # Requests that never finish (beacons, long polls) must not stall every later wait
+        self.inflight.clear()
+        return False